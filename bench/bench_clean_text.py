@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""clean_text 微基准：在 Brave 标题/描述语料上对比旧实现与当前实现的吞吐
+
+用法:
+    python3 bench/bench_clean_text.py             # 跑基准
+    python3 bench/bench_clean_text.py --capture   # 先从 .cache/brave-search.json 抓真实语料
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+CORPUS_PATH = os.path.join(BENCH_DIR, "brave_corpus.json")
+BRAVE_CACHE_PATH = os.path.join(REPO_ROOT, ".cache", "brave-search.json")
+
+
+def clean_text_legacy(text):
+    """改写前的 clean_text（原样保留，作为对照）"""
+    if not text:
+        return ''
+    text = re.sub(r'<[^>]+>', '', text)
+    text = text.replace('&nbsp;', ' ').replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
+    text = text.replace('&#x27;', "'").replace('&#39;', "'").replace('&quot;', '"')
+    text = text.replace('&ldquo;', '"').replace('&rdquo;', '"').replace('&lsquo;', "'").replace('&rsquo;', "'")
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = re.sub(r'Subscribe.*', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'Register.*', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'Login.*', '', text, flags=re.IGNORECASE)
+    return text.strip()
+
+
+def load_current_clean_text():
+    # 只导入 text_clean，不导入 generate-daily.py（它在导入时读密钥、建运行预算）
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    from text_clean import clean_text
+    return clean_text
+
+
+def capture_corpus():
+    with open(BRAVE_CACHE_PATH, "r", encoding="utf-8") as f:
+        cache = json.load(f)
+    items = []
+    seen = set()
+    for entry in cache.values():
+        results = (((entry or {}).get("data") or {}).get("web") or {}).get("results") or []
+        for r in results:
+            key = (r.get("title", ""), r.get("description", ""))
+            if key in seen:
+                continue
+            seen.add(key)
+            items.append({"title": key[0], "description": key[1]})
+    with open(CORPUS_PATH, "w", encoding="utf-8") as f:
+        json.dump({"_note": f"captured from {os.path.basename(BRAVE_CACHE_PATH)}", "source": "brave", "items": items},
+                  f, ensure_ascii=False, indent=1)
+    print(f"✓ 已抓取 {len(items)} 条语料 -> {CORPUS_PATH}")
+
+
+def bench(fn, texts, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for t in texts:
+            fn(t)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--capture", action="store_true", help="从 Brave 缓存抓取真实语料")
+    parser.add_argument("--loops", type=int, default=50, help="每轮把语料重复多少遍")
+    parser.add_argument("--repeat", type=int, default=5, help="取最好成绩的轮数")
+    args = parser.parse_args()
+
+    if args.capture:
+        capture_corpus()
+
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+    items = corpus["items"]
+    synthetic = corpus.get("source") != "brave"
+    texts = [t for it in items for t in (it.get("title", ""), it.get("description", ""))] * args.loops
+    total_chars = sum(len(t) for t in texts)
+
+    clean_text = load_current_clean_text()
+    diffs = sum(1 for it in items for t in (it.get("title", ""), it.get("description", ""))
+                if clean_text(t) != clean_text_legacy(t))
+
+    label = "合成语料（由 URL slug 生成，不是真实 Brave 响应；--capture 换成真实语料）" if synthetic else "Brave 真实响应"
+    print(f"语料: {len(items)} 条（{len(texts)} 段文本，{total_chars / 1e6:.2f}M 字符）— {label}")
+    results = {}
+    for name, fn in (("before", clean_text_legacy), ("after", clean_text)):
+        dt = bench(fn, texts, args.repeat)
+        results[name] = dt
+        print(f"  {name:<6} {len(texts) / dt:>10.0f} 段/秒  {total_chars / dt / 1e6:6.2f}M 字符/秒")
+    print(f"  加速比: {results['before'] / results['after']:.2f}x" + ("（合成语料）" if synthetic else ""))
+    print(f"  输出不同的文本: {diffs} 段（实体解码修正等）")
+
+
+if __name__ == "__main__":
+    main()
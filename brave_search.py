@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Brave 搜索调度器：令牌桶限速 + 并发请求（新闻和工具共用一个配额）"""
+
+import json
+import os
+import queue
+import threading
+import time
+import urllib.parse
+from concurrent.futures import Future
+
+from http_client import get_client
+
+BRAVE_ENDPOINT = "https://api.search.brave.com/res/v1/web/search"
+
+# Free plan = 1 QPS. 默认略低于 1，给网络抖动留一点余量，避免服务端判定超速（429）。
+DEFAULT_QPS = float(os.environ.get("BRAVE_QPS", "0.9") or 0.9)
+DEFAULT_BURST = float(os.environ.get("BRAVE_BURST", "1") or 1)
+DEFAULT_MAX_INFLIGHT = int(os.environ.get("BRAVE_MAX_INFLIGHT", "4") or 4)
+DEFAULT_TIMEOUT = 30
+
+# 缓存 TTL（秒），按 freshness 区分：pd 结果变化快，pw 可以多留一会儿
+CACHE_TTLS = {
+    "pd": int(os.environ.get("BRAVE_CACHE_TTL_PD", "3600") or 3600),
+    "pw": int(os.environ.get("BRAVE_CACHE_TTL_PW", "21600") or 21600),
+}
+CACHE_DEFAULT_TTL = 3600
+CACHE_MAX_ENTRIES = int(os.environ.get("BRAVE_CACHE_MAX_ENTRIES", "200") or 200)
+
+
+class TokenBucket:
+    """线程安全的令牌桶：每秒补充 rate 个令牌，最多攒 capacity 个。"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = max(float(rate), 0.001)
+        self.capacity = max(float(capacity), 1.0)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self):
+        """阻塞直到拿到一个令牌。"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def refund(self):
+        """归还一个没用上的令牌（请求在发出前被取消）。"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+
+class SearchCache:
+    """Brave 响应的磁盘缓存（JSON 文件）。
+
+    key = 规范化后的 q + count + freshness；过期时间按 freshness 取 CACHE_TTLS，
+    超过 max_entries 时淘汰最早写入的条目。
+    """
+
+    def __init__(self, path, ttls=None, max_entries=CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttls = dict(CACHE_TTLS if ttls is None else ttls)
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    @staticmethod
+    def make_key(params):
+        q = " ".join(str(params.get("q", "")).lower().split())
+        return f"{q}|{params.get('count', '')}|{params.get('freshness', '')}"
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+    def get(self, params):
+        key = self.make_key(params)
+        ttl = self.ttls.get(params.get("freshness"), CACHE_DEFAULT_TTL)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.time() - entry.get("ts", 0) <= ttl:
+                self.hits += 1
+                return entry.get("data")
+            self.misses += 1
+            return None
+
+    def put(self, params, data):
+        key = self.make_key(params)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = {"ts": time.time(), "data": data}
+            # dict 保持插入顺序：最前面的就是最早写入的
+            while len(self._entries) > self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._save()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+class BraveSearchScheduler:
+    """所有 Brave 查询的唯一出口。
+
+    submit() 立即返回 Future；后台 worker 按令牌桶节奏发请求，
+    同时在途的请求数最多 max_inflight 个。还没拿到令牌的请求可以被 cancel()，
+    不会浪费配额。命中 cache 的查询直接返回，不占令牌。
+    """
+
+    def __init__(self, api_key, qps=DEFAULT_QPS, burst=DEFAULT_BURST,
+                 max_inflight=DEFAULT_MAX_INFLIGHT, timeout=DEFAULT_TIMEOUT, cache=None):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.cache = cache
+        self.bucket = TokenBucket(qps, burst)
+        self.max_inflight = max(1, int(max_inflight))
+        self._queue = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def submit(self, params):
+        fut = Future()
+        if self.cache is not None:
+            cached = self.cache.get(params)
+            if cached is not None:
+                fut.set_result(cached)
+                return fut
+        self._queue.put((dict(params), fut))
+        self._ensure_workers()
+        return fut
+
+    def search(self, params):
+        """同步版本：提交并等待结果。"""
+        return self.submit(params).result()
+
+    def _ensure_workers(self):
+        with self._lock:
+            while len(self._workers) < self.max_inflight:
+                t = threading.Thread(target=self._worker, name=f"brave-{len(self._workers)}", daemon=True)
+                t.start()
+                self._workers.append(t)
+
+    def _worker(self):
+        while True:
+            params, fut = self._queue.get()
+            if fut.cancelled():
+                continue
+            self.bucket.acquire()
+            if not fut.set_running_or_notify_cancel():
+                self.bucket.refund()
+                continue
+            try:
+                fut.set_result(self._fetch(params))
+            except BaseException as e:
+                fut.set_exception(e)
+
+    def _fetch(self, params):
+        url = BRAVE_ENDPOINT + "?" + urllib.parse.urlencode(params)
+        # 429/5xx 的重试也是一次 Brave 请求：每次重试前先拿令牌，不能绕过 QPS 配额
+        with get_client().get(url, headers={
+            'Accept': 'application/json',
+            'X-Subscription-Token': self.api_key,
+        }, timeout=self.timeout, before_retry=self.bucket.acquire) as response:
+            data = response.json()
+        if self.cache is not None:
+            self.cache.put(params, data)
+        return data
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler(api_key=None, cache_path=None):
+    """返回进程内共享的调度器（第一次调用时创建）。"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            cache = SearchCache(cache_path) if cache_path else None
+            _scheduler = BraveSearchScheduler(api_key or os.environ.get('BRAVE_API_KEY'), cache=cache)
+        return _scheduler
@@ -3,11 +3,14 @@
 AI Daily - 简单美观的首页 + 每日归档生成器
 """
 
+import argparse
+import hashlib
 import os
 import re
 import json
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from markdown import Markdown
 import html
 
 CSS = """
@@ -339,36 +342,109 @@ footer a { color: #d4893a !important; }
 </style>
 """
 
-def get_daily_files():
+# 模板 / 卡片 HTML 结构改动时 +1；CSS 和本文件内容也计入模板版本，改了就全量重建
+TEMPLATE_REVISION = 1
+# 增量构建清单：每个页面的源文件哈希、模板版本、输出哈希
+BUILD_MANIFEST = os.path.join('.cache', 'build-manifest.json')
+# 归档信息清单（进 git）：每篇日报的标题、时间、条目数、内容哈希，首页只读它
+ARCHIVE_MANIFEST = os.path.join('daily', 'manifest.json')
+# 并行渲染日报页面的进程数（1 = 串行，0 = CPU 核数）和每批交给一个进程的页面数
+BUILD_WORKERS = int(os.environ.get('BUILD_WORKERS', '1') or 1)
+BUILD_CHUNK_SIZE = int(os.environ.get('BUILD_CHUNK_SIZE', '4') or 4)
+
+_template_version = None
+
+
+def _hash_bytes(*parts):
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part)
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def _read_bytes(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def template_version():
+    global _template_version
+    if _template_version is None:
+        _template_version = _hash_bytes(str(TEMPLATE_REVISION).encode(), CSS.encode('utf-8'),
+                                        _read_bytes(os.path.abspath(__file__)) or b'')
+    return _template_version
+
+
+def load_build_manifest(root='.'):
+    try:
+        with open(os.path.join(root, BUILD_MANIFEST), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get('pages'), dict):
+            return data
+    except Exception:
+        pass
+    return {'pages': {}}
+
+
+def save_build_manifest(manifest, root='.'):
+    path = os.path.join(root, BUILD_MANIFEST)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def write_if_changed(path, text):
+    """内容没变就不写（mtime 和 git status 都保持安静），返回是否真的写了。"""
+    data = text.encode('utf-8')
+    if _read_bytes(path) == data:
+        return False
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def get_daily_files(root='.'):
     """获取所有日报文件"""
-    daily_dir = 'daily'
+    daily_dir = os.path.join(root, 'daily')
     if not os.path.exists(daily_dir):
         return []
     files = sorted([f for f in os.listdir(daily_dir) if f.endswith('.md')])
     return files
 
-def parse_daily_file(filepath):
-    """解析日报文件，提取标题和日期"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+def parse_daily_meta(content):
+    """从日报 markdown 提取标题和日期"""
     title_match = re.search(r'^# (.+)$', content, re.MULTILINE)
     date_match = re.search(r'^日期: (\d{4}-\d{2}-\d{2}(?:\s+\d{2}:\d{2})?)', content, re.MULTILINE)
     
     title = title_match.group(1) if title_match else 'AI Daily'
     date = date_match.group(1) if date_match else ''
+    return title, date
+
+def parse_daily_file(filepath):
+    """解析日报文件，提取标题和日期"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
     
+    title, date = parse_daily_meta(content)
     return title, date, content
 
 def convert_markdown(content):
     """简单Markdown转HTML"""
+    # 用到时才导入：只刷新首页（--index-only）时完全不需要 markdown
+    from markdown import Markdown
     md = Markdown(extensions=['tables', 'fenced_code'])
     html_content = md.convert(content)
     return html_content
 
 
-def get_update_history(limit=8):
-    path = os.path.join('logs', 'update-history.json')
+def get_update_history(limit=8, root='.'):
+    path = os.path.join(root, 'logs', 'update-history.json')
     if not os.path.exists(path):
         return []
     try:
@@ -379,8 +455,8 @@ def get_update_history(limit=8):
         return []
 
 
-def get_system_log_history(limit=8):
-    path = os.path.join('logs', 'system-log-history.json')
+def get_system_log_history(limit=8, root='.'):
+    path = os.path.join(root, 'logs', 'system-log-history.json')
     if not os.path.exists(path):
         return []
     try:
@@ -391,8 +467,8 @@ def get_system_log_history(limit=8):
         return []
 
 
-def get_doc_update_history(limit=8):
-    path = os.path.join('logs', 'doc-update-history.json')
+def get_doc_update_history(limit=8, root='.'):
+    path = os.path.join(root, 'logs', 'doc-update-history.json')
     if not os.path.exists(path):
         return []
     try:
@@ -403,8 +479,8 @@ def get_doc_update_history(limit=8):
         return []
 
 
-def render_update_log_html():
-    history = get_update_history(8)
+def render_update_log_html(root='.'):
+    history = get_update_history(8, root)
     if not history:
         return '<div class="update-log"><h2>📝 更新日志</h2><div class="update-item">暂无更新记录</div></div>'
 
@@ -422,8 +498,8 @@ def render_update_log_html():
     return '<div class="update-log"><h2>📝 更新日志</h2>' + ''.join(rows) + '</div>'
 
 
-def render_system_log_html():
-    history = get_system_log_history(8)
+def render_system_log_html(root='.'):
+    history = get_system_log_history(8, root)
     if not history:
         return '<div class="system-log"><h2>🖥️ 系统日志更新</h2><div class="update-item">暂无系统日志更新记录</div></div>'
 
@@ -443,8 +519,8 @@ def render_system_log_html():
     return '<div class="system-log"><h2>🖥️ 系统日志更新</h2>' + ''.join(rows) + '</div>'
 
 
-def render_doc_update_html():
-    history = get_doc_update_history(8)
+def render_doc_update_html(root='.'):
+    history = get_doc_update_history(8, root)
     if not history:
         return '<div class="doc-log"><h2>📄 文档更新记录</h2><div class="update-item">暂无文档更新记录</div></div>'
 
@@ -476,27 +552,121 @@ def render_doc_update_html():
     return '<div class="doc-log"><h2>📄 文档更新记录</h2>' + ''.join(rows) + '</div>'
 
 
-def generate_index_html():
-    """生成首页"""
-    files = get_daily_files()
+def count_daily_items(content):
+    """老日报（只有 markdown）的条目数：按 ## 分节数 ### 标题。"""
+    news = tools = 0
+    section = ''
+    for line in content.splitlines():
+        if line.startswith('## '):
+            section = line
+        elif line.startswith('### '):
+            if '今日新闻' in section:
+                news += 1
+            elif '工具推荐' in section:
+                tools += 1
+    return news, tools
+
+
+def day_metadata(f, md_bytes, json_bytes):
+    """一篇日报的归档信息：标题、时间、条目数、内容哈希。"""
+    content = md_bytes.decode('utf-8')
+    title, date = parse_daily_meta(content)
+    news, tools = count_daily_items(content)
+    if json_bytes:
+        try:
+            edition = json.loads(json_bytes.decode('utf-8'))
+            news, tools = len(edition.get('news') or []), len(edition.get('tools') or [])
+        except Exception:
+            pass
+    return {
+        'date': f[:-3],
+        'title': title,
+        'timestamp': date,
+        'news_count': news,
+        'tool_count': tools,
+        'hash': _hash_bytes(md_bytes, json_bytes or b''),
+    }
+
+
+def load_archive_manifest(root='.'):
+    try:
+        with open(os.path.join(root, ARCHIVE_MANIFEST), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get('days'), dict):
+            return data
+    except Exception:
+        pass
+    return {'version': 1, 'days': {}}
+
+
+def update_archive_manifest(root='.'):
+    """把 daily/manifest.json 和 daily/ 同步，返回最新清单。
+
+    先比 (大小, mtime)（记在 .cache 的构建清单里，不进 git），变了才读文件算哈希；
+    哈希也没变就不动归档信息。所以开销随日报篇数增长，而不是随归档总字节数。
+    """
+    archive = load_archive_manifest(root)
+    days = archive['days']
+    build_manifest = load_build_manifest(root)
+    stats = build_manifest.setdefault('archive_stat', {})
+    daily_dir = os.path.join(root, 'daily')
+    files = get_daily_files(root)
+    for f in files:
+        md_path = os.path.join(daily_dir, f)
+        json_path = os.path.join(daily_dir, f[:-3] + '.json')
+        fingerprint = []
+        for path in (md_path, json_path):
+            try:
+                st = os.stat(path)
+                fingerprint += [st.st_size, st.st_mtime_ns]
+            except OSError:
+                fingerprint += [None, None]
+        if f in days and stats.get(f) == fingerprint:
+            continue
+        md_bytes = _read_bytes(md_path) or b''
+        json_bytes = _read_bytes(json_path)
+        digest = _hash_bytes(md_bytes, json_bytes or b'')
+        if (days.get(f) or {}).get('hash') != digest:
+            days[f] = day_metadata(f, md_bytes, json_bytes)
+        stats[f] = fingerprint
+    existing = set(files)
+    for table in (days, stats):
+        for f in [f for f in table if f not in existing]:
+            del table[f]
+
+    path = os.path.join(root, ARCHIVE_MANIFEST)
+    if os.path.isdir(daily_dir):
+        write_if_changed(path, json.dumps(archive, ensure_ascii=False, indent=1, sort_keys=True) + '\n')
+    save_build_manifest(build_manifest, root)
+    return archive
+
+
+def archive_entries(archive, root='.'):
+    """归档列表 [(文件名, 标题, 时间)]，按文件名排序；清单里还没有的日报先用文件名里的日期顶上。"""
+    days = archive['days']
+    entries = []
+    missing = 0
+    for f in get_daily_files(root):
+        meta = days.get(f)
+        if meta is None:
+            missing += 1
+            meta = {}
+        entries.append((f, meta.get('title', 'AI Daily'), meta.get('timestamp', f[:-3])))
+    if missing:
+        print(f"  {missing} 篇日报不在 {ARCHIVE_MANIFEST} 里，先用日期代替（完整构建一次即可补上）")
+    return entries
+
+
+def generate_index_html(root='.', archive=None):
+    """生成首页；归档列表来自 daily/manifest.json（archive 为 None 时先同步一次清单）。"""
+    if archive is None:
+        archive = update_archive_manifest(root)
     
     items_html = ''
-    for f in files:
-        date_str = f.replace('.md', '')
-        title, date, _ = parse_daily_file(f'daily/{f}')
+    for f, title, date in archive_entries(archive, root):
         
         # 格式化日期显示（精确到分钟）
-        try:
-            if ' ' in date and ':' in date:
-                # 格式: 2026-02-02 09:30
-                date_obj = datetime.strptime(date, '%Y-%m-%d %H:%M')
-                date_display = date_obj.strftime('%Y年%m月%d日 %H:%M')
-            else:
-                # 格式: 2026-02-02
-                date_obj = datetime.strptime(date, '%Y-%m-%d')
-                date_display = date_obj.strftime('%Y年%m月%d日')
-        except:
-            date_display = date
+        date_display = format_date_display(date)
         
         items_html += f'''
 <a href="./daily/{f.replace('.md', '.html')}" class="archive-item">
@@ -505,9 +675,9 @@ def generate_index_html():
     <span class="archive-arrow">→</span>
 </a>'''
     
-    update_log_html = render_update_log_html()
-    system_log_html = render_system_log_html()
-    doc_update_html = render_doc_update_html()
+    update_log_html = render_update_log_html(root)
+    system_log_html = render_system_log_html(root)
+    doc_update_html = render_doc_update_html(root)
 
     html = f"""<!DOCTYPE html>
 <html lang="zh-CN">
@@ -540,66 +710,49 @@ def generate_index_html():
 </body>
 </html>"""
 
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(html)
-    print(f"✓ 生成首页: index.html")
+    if write_if_changed(os.path.join(root, 'index.html'), html):
+        print(f"✓ 生成首页: index.html")
+    else:
+        print(f"✓ 首页无变化: index.html")
 
-def generate_daily_pages():
-    """生成每个日报页面"""
-    files = get_daily_files()
-    
-    # 工具图标和颜色配置
-    tool_config = {
-        'v0': {'icon': '🎨', 'color': 'purple'},
-        'cursor': {'icon': '💻', 'color': 'blue'},
-        'perplexity': {'icon': '🔍', 'color': 'teal'},
-        'langchain': {'icon': '⛓️', 'color': 'orange'},
-        'hugging': {'icon': '🤗', 'color': 'pink'},
-        'claude': {'icon': '🤖', 'color': 'orange'},
-        'chatgpt': {'icon': '💬', 'color': 'green'},
-        'midjourney': {'icon': '🎭', 'color': 'purple'},
-        'notion': {'icon': '📝', 'color': 'blue'},
-        'github': {'icon': '🐙', 'color': 'purple'},
-        'default': {'icon': '🛠️', 'color': 'blue'}
-    }
+# 工具图标和颜色配置
+TOOL_CONFIG = {
+    'v0': {'icon': '🎨', 'color': 'purple'},
+    'cursor': {'icon': '💻', 'color': 'blue'},
+    'perplexity': {'icon': '🔍', 'color': 'teal'},
+    'langchain': {'icon': '⛓️', 'color': 'orange'},
+    'hugging': {'icon': '🤗', 'color': 'pink'},
+    'claude': {'icon': '🤖', 'color': 'orange'},
+    'chatgpt': {'icon': '💬', 'color': 'green'},
+    'midjourney': {'icon': '🎭', 'color': 'purple'},
+    'notion': {'icon': '📝', 'color': 'blue'},
+    'github': {'icon': '🐙', 'color': 'purple'},
+    'default': {'icon': '🛠️', 'color': 'blue'}
+}
 
-    def get_tool_config(name):
-        name_lower = name.lower()
-        for key, config in tool_config.items():
-            if key in name_lower:
-                return config
-        return tool_config['default']
-    
-    for f in files:
-        title, date, content = parse_daily_file(f'daily/{f}')
-        
-        # 格式化日期（精确到分钟）
-        try:
-            if ' ' in date and ':' in date:
-                date_obj = datetime.strptime(date, '%Y-%m-%d %H:%M')
-                date_display = date_obj.strftime('%Y年%m月%d日 %H:%M')
-            else:
-                date_obj = datetime.strptime(date, '%Y-%m-%d')
-                date_display = date_obj.strftime('%Y年%m月%d日')
-        except:
-            date_display = date
-        
-        html_content = convert_markdown(content)
-
-        # 移除标题行和日期行（因为我们在header中显示）
-        html_content = re.sub(r'^<h1>.*?</h1>', '', html_content, flags=re.MULTILINE)
-        html_content = re.sub(r'^<p>日期:.*?</p>', '', html_content, flags=re.MULTILINE)
-
-        # 处理新闻卡片
-        news_cards = []
-        def replace_news(match):
-            news_title = match.group(1)
-            source_link = match.group(2)
-            source_name = match.group(3)
-            summary = match.group(4)
-            read_link = match.group(5)
-
-            card = f'''<div class="card">
+
+def get_tool_config(name):
+    name_lower = name.lower()
+    for key, config in TOOL_CONFIG.items():
+        if key in name_lower:
+            return config
+    return TOOL_CONFIG['default']
+
+
+def format_date_display(date):
+    """格式化日期（精确到分钟）"""
+    try:
+        if ' ' in date and ':' in date:
+            date_obj = datetime.strptime(date, '%Y-%m-%d %H:%M')
+            return date_obj.strftime('%Y年%m月%d日 %H:%M')
+        date_obj = datetime.strptime(date, '%Y-%m-%d')
+        return date_obj.strftime('%Y年%m月%d日')
+    except:
+        return date
+
+
+def render_news_card(news_title, source_link, source_name, summary, read_link):
+    return f'''<div class="card">
     <div class="card-content">
         <h3>{news_title}</h3>
         <p class="source">来源: <a href="{source_link}">{source_name}</a></p>
@@ -607,32 +760,11 @@ def generate_daily_pages():
         <a href="{read_link}" class="read-more" target="_blank">阅读原文 →</a>
     </div>
 </div>'''
-            news_cards.append(card)
-            return '<!--NEWS_PLACEHOLDER-->'
-
-        # 转换新闻格式: <h3>标题</h3><p>来源: <a href="url">名称</a></p><p>摘要</p><p><a href="url">阅读原文</a></p>
-        html_content = re.sub(
-            r'<h3>([^<]+)</h3>\s*<p>来源:\s*<a[^>]*href="([^"]*)"[^>]*>([^<]+)</a></p>\s*<p>([^<]+)</p>\s*<p><a[^>]*href="([^"]*)"[^>]*>阅读原文</a></p>\s*(?:<hr\s*/?>)?',
-            replace_news,
-            html_content,
-            flags=re.DOTALL
-        )
 
-        # 将新闻卡片包装在网格容器中
-        if news_cards:
-            news_grid = '<div class="news-grid">\n' + '\n'.join(news_cards) + '\n</div>'
-            html_content = html_content.replace('<!--NEWS_PLACEHOLDER-->', news_grid, 1)
-            html_content = html_content.replace('<!--NEWS_PLACEHOLDER-->', '')
-
-        # 处理工具卡片 - 添加图标和颜色
-        tool_cards = []
-        def replace_tool(match):
-            tool_name = match.group(1) if match.group(1) else ''
-            tool_desc = match.group(2) if match.group(2) else ''
-            tool_link = match.group(3) if match.group(3) else '#'
-            config = get_tool_config(tool_name)
-
-            card = f'''<div class="tool-card">
+
+def render_tool_card(tool_name, tool_desc, tool_link):
+    config = get_tool_config(tool_name)
+    return f'''<div class="tool-card">
     <div class="tool-header">
         <div class="tool-icon {config['color']}">{config['icon']}</div>
         <div class="tool-info">
@@ -642,31 +774,10 @@ def generate_daily_pages():
     </div>
     <a href="{tool_link}" class="tool-link" target="_blank">访问 →</a>
 </div>'''
-            tool_cards.append(card)
-            return '<!--TOOL_PLACEHOLDER-->'
-
-        # 转换工具推荐格式: <h3>工具名</h3><p>📝 描述</p><p>🔗 <a>访问</a></p>
-        html_content = re.sub(
-            r'<h3>([^<]+)</h3>\s*<p>📝\s*([^<]+)</p>\s*<p>🔗\s*<a[^>]*href="([^"]*)"[^>]*>[^<]*</a></p>\s*(?:<hr\s*/?>)?',
-            replace_tool,
-            html_content,
-            flags=re.DOTALL
-        )
 
-        # 将工具卡片包装在网格容器中
-        if tool_cards:
-            tools_grid = '<div class="tools-grid">\n' + '\n'.join(tool_cards) + '\n</div>'
-            # 替换第一个占位符为网格，删除其余占位符
-            html_content = html_content.replace('<!--TOOL_PLACEHOLDER-->', tools_grid, 1)
-            html_content = html_content.replace('<!--TOOL_PLACEHOLDER-->', '')
 
-        # 清理多余的 <hr> 标签
-        html_content = re.sub(r'<hr\s*/?>', '', html_content)
-
-        # 给 <h2> 段落标题加 section-title 类
-        html_content = re.sub(r'<h2>', '<h2 class="section-title">', html_content)
-        
-        html = f"""<!DOCTYPE html>
+def render_day_page(title, date_display, html_content):
+    return f"""<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
@@ -695,15 +806,251 @@ def generate_daily_pages():
 </body>
 </html>"""
 
-        os.makedirs('daily', exist_ok=True)
-        with open(f'daily/{f.replace(".md", ".html")}', 'w', encoding='utf-8') as file:
-            file.write(html)
-        print(f"✓ 生成日报: daily/{f.replace('.md', '.html')}")
+
+def load_edition(md_name, root='.'):
+    """读取与 daily/<date>.md 同名的结构化日报 daily/<date>.json；没有（老日报）返回 None。"""
+    path = os.path.join(root, 'daily', md_name[:-3] + '.json')
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception:
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get('news'), list):
+        return None
+    return data
+
+
+def render_edition_content(edition):
+    """直接从结构化日报生成正文（新闻卡片 + 工具卡片），不经过 markdown。"""
+    esc = html.escape
+    parts = ['<h2 class="section-title">📰 今日新闻</h2>']
+    news_cards = [
+        render_news_card(esc(n.get('title', '')), esc(n.get('url', ''), quote=True), esc(n.get('source', '')),
+                         esc(n.get('summary', '')), esc(n.get('url', ''), quote=True))
+        for n in edition.get('news') or []
+    ]
+    if news_cards:
+        parts.append('<div class="news-grid">\n' + '\n'.join(news_cards) + '\n</div>')
+
+    parts.append('<h2 class="section-title">🛠️ 工具推荐</h2>')
+    tool_cards = [
+        render_tool_card(esc(t.get('name', '')), esc(t.get('desc', '')), esc(t.get('url') or '#', quote=True))
+        for t in edition.get('tools') or []
+    ]
+    if tool_cards:
+        parts.append('<div class="tools-grid">\n' + '\n'.join(tool_cards) + '\n</div>')
+    else:
+        parts.append('<p>今天没抓到足够靠谱的新工具更新（可能被限流/来源不稳定）。</p>')
+
+    date = esc(edition.get('date', ''))
+    parts.append(f'<h2 class="section-title">📚 归档</h2>\n<ul>\n<li><a href="./{date}.html">{date}</a></li>\n</ul>')
+    return '\n'.join(parts)
+
+
+def render_markdown_content(content):
+    """老日报（没有 JSON）：markdown 转 HTML 后用正则把新闻/工具段落改写成卡片。"""
+    html_content = convert_markdown(content)
+
+    # 移除标题行和日期行（因为我们在header中显示）
+    html_content = re.sub(r'^<h1>.*?</h1>', '', html_content, flags=re.MULTILINE)
+    html_content = re.sub(r'^<p>日期:.*?</p>', '', html_content, flags=re.MULTILINE)
+
+    # 处理新闻卡片
+    news_cards = []
+    def replace_news(match):
+        news_cards.append(render_news_card(*match.group(1, 2, 3, 4, 5)))
+        return '<!--NEWS_PLACEHOLDER-->'
+
+    # 转换新闻格式: <h3>标题</h3><p>来源: <a href="url">名称</a></p><p>摘要</p><p><a href="url">阅读原文</a></p>
+    html_content = re.sub(
+        r'<h3>([^<]+)</h3>\s*<p>来源:\s*<a[^>]*href="([^"]*)"[^>]*>([^<]+)</a></p>\s*<p>([^<]+)</p>\s*<p><a[^>]*href="([^"]*)"[^>]*>阅读原文</a></p>\s*(?:<hr\s*/?>)?',
+        replace_news,
+        html_content,
+        flags=re.DOTALL
+    )
+
+    # 将新闻卡片包装在网格容器中
+    if news_cards:
+        news_grid = '<div class="news-grid">\n' + '\n'.join(news_cards) + '\n</div>'
+        html_content = html_content.replace('<!--NEWS_PLACEHOLDER-->', news_grid, 1)
+        html_content = html_content.replace('<!--NEWS_PLACEHOLDER-->', '')
+
+    # 处理工具卡片 - 添加图标和颜色
+    tool_cards = []
+    def replace_tool(match):
+        tool_name = match.group(1) if match.group(1) else ''
+        tool_desc = match.group(2) if match.group(2) else ''
+        tool_link = match.group(3) if match.group(3) else '#'
+        tool_cards.append(render_tool_card(tool_name, tool_desc, tool_link))
+        return '<!--TOOL_PLACEHOLDER-->'
+
+    # 转换工具推荐格式: <h3>工具名</h3><p>📝 描述</p><p>🔗 <a>访问</a></p>
+    html_content = re.sub(
+        r'<h3>([^<]+)</h3>\s*<p>📝\s*([^<]+)</p>\s*<p>🔗\s*<a[^>]*href="([^"]*)"[^>]*>[^<]*</a></p>\s*(?:<hr\s*/?>)?',
+        replace_tool,
+        html_content,
+        flags=re.DOTALL
+    )
+
+    # 将工具卡片包装在网格容器中
+    if tool_cards:
+        tools_grid = '<div class="tools-grid">\n' + '\n'.join(tool_cards) + '\n</div>'
+        # 替换第一个占位符为网格，删除其余占位符
+        html_content = html_content.replace('<!--TOOL_PLACEHOLDER-->', tools_grid, 1)
+        html_content = html_content.replace('<!--TOOL_PLACEHOLDER-->', '')
+
+    # 清理多余的 <hr> 标签
+    html_content = re.sub(r'<hr\s*/?>', '', html_content)
+
+    # 给 <h2> 段落标题加 section-title 类
+    html_content = re.sub(r'<h2>', '<h2 class="section-title">', html_content)
+    return html_content
+
+
+def render_daily_page(f, root='.', edition=None):
+    """生成 daily/<f> 对应的 HTML：有结构化日报（传入的或 JSON 文件）就直接出卡片，否则走 markdown。"""
+    if edition is None:
+        edition = load_edition(f, root)
+    if edition is not None:
+        title = html.escape(edition.get('title') or 'AI Daily')
+        date = edition.get('generated_at') or edition.get('date', '')
+        html_content = render_edition_content(edition)
+    else:
+        title, date, content = parse_daily_file(os.path.join(root, 'daily', f))
+        html_content = render_markdown_content(content)
+    return render_day_page(title, format_date_display(date), html_content)
+
+
+def _render_page_job(job):
+    """进程池里跑的单页渲染（顶层函数才能被 pickle）。"""
+    f, root, edition = job
+    return render_daily_page(f, root, edition)
+
+
+def render_pages(jobs, workers=None, chunk_size=None):
+    """渲染一组页面，返回与 jobs 同序的 HTML 列表。
+
+    markdown 转换和卡片改写的正则都是纯 CPU，页面多时分批交给进程池；
+    结果按提交顺序取回、由调用方统一写盘，所以输出和串行完全一样。
+    页面不够分两批、或进程池起不来时直接串行。
+    """
+    workers = BUILD_WORKERS if workers is None else workers
+    chunk_size = max(1, chunk_size or BUILD_CHUNK_SIZE)
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, -(-len(jobs) // chunk_size))
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_render_page_job, jobs, chunksize=chunk_size))
+            print(f"  并行渲染 {len(jobs)} 页（{workers} 个进程，每批 {chunk_size} 页）")
+            return results
+        except (OSError, RuntimeError) as e:
+            # BrokenProcessPool 也是 RuntimeError 的子类
+            print(f"  进程池不可用，改为串行渲染: {e}")
+    return [_render_page_job(job) for job in jobs]
+
+
+def generate_daily_pages(root='.', pages=None, editions=None, incremental=True, workers=None):
+    """生成日报页面；pages 为 None 时生成全部，否则只生成列出的日期（如 ['2026-03-07']）。
+
+    editions: {日期: 结构化日报}，调用方手里已有的数据直接用，不再读 JSON。
+    incremental: 源文件哈希和模板版本都和清单一致、输出也没被改过的页面直接跳过；
+    重新渲染出的内容和磁盘上一样时也不写文件。
+    workers: 渲染进程数，见 render_pages。
+    """
+    editions = editions or {}
+    all_files = get_daily_files(root)
+    files = all_files
+    if pages is not None:
+        wanted = set(pages)
+        files = [f for f in files if f[:-3] in wanted]
+
+    manifest = load_build_manifest(root)
+    entries = manifest['pages']
+    tver = template_version()
+    rebuilt = skipped = unchanged = 0
+
+    # 先挑出需要重新渲染的页面，再统一渲染、按文件名顺序写盘
+    stale = []
+    for f in files:
+        out_name = f.replace(".md", ".html")
+        out_path = os.path.join(root, 'daily', out_name)
+        # 页面的输入：markdown + 同名 JSON（有的话）
+        source = _hash_bytes(_read_bytes(os.path.join(root, 'daily', f)) or b'',
+                             _read_bytes(os.path.join(root, 'daily', f[:-3] + '.json')) or b'')
+        entry = entries.get(f) or {}
+        if (incremental and entry.get('source') == source and entry.get('template') == tver
+                and _hash_bytes(_read_bytes(out_path) or b'') == entry.get('output')):
+            skipped += 1
+            continue
+        stale.append((f, out_name, out_path, source))
+
+    htmls = render_pages([(f, root, editions.get(f[:-3])) for f, _, _, _ in stale], workers)
+    for (f, out_name, out_path, source), html in zip(stale, htmls):
+        entries[f] = {'source': source, 'template': tver, 'output': _hash_bytes(html.encode('utf-8'))}
+        if write_if_changed(out_path, html):
+            rebuilt += 1
+            print(f"✓ 生成日报: daily/{out_name}")
+        else:
+            unchanged += 1
+
+    # 已删除的日报不再留在清单里
+    existing = set(all_files)
+    for f in [f for f in entries if f not in existing]:
+        del entries[f]
+    manifest['template'] = tver
+    save_build_manifest(manifest, root)
+    print(f"✓ 日报页面: 重建 {rebuilt}，未变化跳过 {skipped}，重新渲染但内容相同 {unchanged}")
+    return {'rebuilt': rebuilt, 'skipped': skipped, 'unchanged': unchanged}
+
+
+OUTPUTS = ('index', 'pages')
+
+
+def build_index_only(root='.'):
+    """只刷新首页（日志面板更新后用）：归档信息直接取 daily/manifest.json，
+    只读三个日志 JSON，不打开 daily/*.md，也不导入 markdown。"""
+    t0 = time.perf_counter()
+    generate_index_html(root, archive=load_archive_manifest(root))
+    print(f"✓ 首页刷新用时 {(time.perf_counter() - t0) * 1000:.1f}ms")
+
+
+def build(root='.', outputs=OUTPUTS, pages=None, editions=None, incremental=True, workers=None):
+    """可导入的构建入口（generate-daily.py 进程内调用，CLI 也走这里）。
+
+    root: 站点根目录（含 daily/、logs/）；outputs: 要生成的部分，'index' 和/或 'pages'；
+    pages / editions / incremental / workers: 见 generate_daily_pages。
+    """
+    unknown = set(outputs) - set(OUTPUTS)
+    if unknown:
+        raise ValueError(f"unknown outputs: {sorted(unknown)}")
+    if 'index' in outputs:
+        generate_index_html(root)
+    if 'pages' in outputs:
+        generate_daily_pages(root, pages=pages, editions=editions, incremental=incremental, workers=workers)
 
 def main():
+    parser = argparse.ArgumentParser(description="AI Daily 首页 + 每日归档生成器")
+    parser.add_argument('--root', default='.', help="站点根目录（默认当前目录）")
+    parser.add_argument('--only', choices=OUTPUTS, help="只生成首页或只生成日报页面")
+    parser.add_argument('--page', action='append', dest='pages', metavar='DATE', help="只生成指定日期的页面（可重复）")
+    parser.add_argument('--full', action='store_true', help="忽略增量清单，全部重新渲染")
+    parser.add_argument('--jobs', '-j', type=int, metavar='N',
+                        help="并行渲染的进程数（0 = CPU 核数，默认取 BUILD_WORKERS，即串行）")
+    parser.add_argument('--index-only', action='store_true',
+                        help="只用缓存的归档信息刷新首页（日志面板），不读日报、不导入 markdown")
+    args = parser.parse_args()
+
+    if args.index_only:
+        build_index_only(args.root)
+        return
+
     print("🤖 AI Daily Generator\n")
-    generate_index_html()
-    generate_daily_pages()
+    build(args.root, outputs=(args.only,) if args.only else OUTPUTS, pages=args.pages,
+          incremental=not args.full, workers=args.jobs)
     print("\n✨ 完成！")
 
 if __name__ == '__main__':
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""整次运行的时间预算：总预算按阶段切分，超时的阶段降级而不是拖住整次运行"""
+
+import os
+import threading
+import time
+
+# 总预算（秒）；显式设成 0 表示不限时（旧行为），留空按默认 90
+DEFAULT_DEADLINE = float(os.environ.get("RUN_DEADLINE", "").strip() or 90)
+
+# 各阶段占总预算的比例，按流水线顺序累加成各阶段的截止时间。
+# 阶段之间有重叠（工具解析和新闻翻译并行），前面省下的时间后面自动能用。
+STAGE_SHARES = (
+    ("search", 0.35),     # Brave 新闻 + 工具查询
+    ("resolve", 0.20),    # 工具文章 -> 直达链接
+    ("translate", 0.30),  # DeepSeek 翻译
+    ("render", 0.15),     # 写 markdown / HTML
+)
+
+STAGE_LABELS = {"search": "搜索", "resolve": "直达链接解析", "translate": "翻译", "render": "渲染"}
+
+
+class RunBudget:
+    """deadline(stage) 返回该阶段的截止时间（time.monotonic()），remaining(stage) 返回剩余秒数。
+
+    total <= 0 时不限时：remaining() 返回 None，timeout() 原样返回默认值。
+    degrade() 记下实际采用的降级措施，运行结束后写进更新日志。
+    """
+
+    def __init__(self, total=DEFAULT_DEADLINE, shares=STAGE_SHARES):
+        self.total = max(0.0, float(total or 0))
+        self._deadlines = {}
+        acc = 0.0
+        for stage, share in shares:
+            acc += share
+            self._deadlines[stage] = acc
+        self._scale = acc or 1.0
+        self.degradations = []
+        self._lock = threading.Lock()
+        self.start()
+
+    @property
+    def enabled(self):
+        return self.total > 0
+
+    def start(self):
+        self.started = time.monotonic()
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def deadline(self, stage=None):
+        """stage 为 None 时返回整次运行的截止时间。"""
+        if not self.enabled:
+            return None
+        if stage is None:
+            return self.started + self.total
+        return self.started + self.total * self._deadlines[stage] / self._scale
+
+    def remaining(self, stage=None):
+        """该阶段（stage 为 None 时为整次运行）还剩多少秒（可能为负）；不限时返回 None。"""
+        dl = self.deadline(stage)
+        return None if dl is None else dl - time.monotonic()
+
+    def expired(self, stage):
+        left = self.remaining(stage)
+        return left is not None and left <= 0
+
+    def timeout(self, stage, default, floor=1.0):
+        """给网络请求 / Future.result() 用的超时：不超过阶段剩余时间，但至少 floor 秒。"""
+        left = self.remaining(stage)
+        if left is None:
+            return default
+        return max(floor, min(default, left)) if default is not None else max(floor, left)
+
+    def degrade(self, stage, detail):
+        with self._lock:
+            self.degradations.append({"stage": stage, "detail": detail, "at": round(self.elapsed(), 1)})
+        print(f"  ⏱️ 降级（{STAGE_LABELS.get(stage, stage)}）: {detail}")
+
+    def report(self):
+        with self._lock:
+            return {
+                "deadline_seconds": self.total,
+                "elapsed_seconds": round(self.elapsed(), 1),
+                "degradations": list(self.degradations),
+            }
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""从流式下载的文章页 HTML 里抽出工具的直达入口（GitHub repo / PyPI / npm / HF space & model）"""
+
+import re
+
+DIRECT_ENTRY_RE = re.compile(
+    r"https?://github\.com/[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+"
+    r"|https?://pypi\.org/project/[A-Za-z0-9_.-]+/?"
+    r"|https?://www\.npmjs\.com/package/[A-Za-z0-9_.@/-]+"
+    r"|https?://huggingface\.co/spaces/[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+"
+    r"|https?://huggingface\.co/models/[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+"
+)
+MAX_URL_LEN = 2048
+# 块末尾可能切在 "ht|tps://" 中间：至少留下这么多字符
+_SCHEME_TAIL = len("https://")
+
+
+def iter_direct_entries(text_chunks):
+    """Yield direct entry URLs (document order, de-duped) from a stream of HTML text chunks.
+
+    A match that touches the end of the current buffer may still continue in the
+    next chunk, so it is carried over from its own start instead of being reported
+    early. Without such a match, only a URL prefix that does not match yet (the
+    last "http://" / "https://" in the tail) or a few characters are carried.
+    """
+    carry = ""
+    seen_u = set()
+    pieces = iter(text_chunks)
+    while True:
+        piece = next(pieces, None)
+        final = piece is None
+        text = carry + (piece or "")
+        emitted_end = 0
+        pending = None
+        for m in DIRECT_ENTRY_RE.finditer(text):
+            if not final and m.end() == len(text):
+                pending = m.start()
+                break
+            emitted_end = m.end()
+            u = m.group(0).rstrip("/")
+            if u not in seen_u:
+                seen_u.add(u)
+                yield u
+        if final:
+            return
+        if pending is not None and len(text) - pending <= MAX_URL_LEN:
+            carry = text[pending:]
+            continue
+        # 路径里的 "http"（如 /encode/httpx）不能当起点，只认带 "://" 的协议头
+        lo = max(emitted_end, len(text) - MAX_URL_LEN)
+        start = max(text.rfind("http://", lo), text.rfind("https://", lo))
+        carry = text[start:] if start >= 0 else text[-_SCHEME_TAIL:]
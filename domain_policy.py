@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""域名策略索引：按反转的域名标签建前缀树，一次查询得到 allow/deny、来源权重和展示名称"""
+
+import json
+import os
+from urllib.parse import urlparse
+
+DOMAINS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "domains.json")
+
+_FIELDS = ("allow", "deny", "weight", "name")
+
+
+def normalize_host(url_or_host):
+    """URL 或 host -> 小写 host（去掉端口和开头的 www.）。"""
+    s = (url_or_host or "").strip().lower()
+    if "//" in s:
+        s = urlparse(s).netloc
+    s = s.rsplit("@", 1)[-1].split(":", 1)[0].rstrip(".")
+    if s.startswith("www."):
+        s = s[4:]
+    return s
+
+
+class DomainPolicyIndex:
+    """后缀匹配：com -> microsoft -> news，沿路合并策略，越具体的条目优先。"""
+
+    def __init__(self, entries):
+        self._root = {}
+        for domain, spec in entries.items():
+            if not isinstance(spec, dict):
+                continue
+            node = self._root
+            for label in reversed(normalize_host(domain).split(".")):
+                node = node.setdefault(label, {})
+            node[""] = {k: spec[k] for k in _FIELDS if k in spec}
+
+    def lookup(self, url_or_host):
+        """返回 {"host", "domain", "allow", "deny", "weight", "name"}。
+
+        domain 是命中的最具体条目（未收录则为 None，allow/deny 都是 False）。
+        """
+        host = normalize_host(url_or_host)
+        policy = {"host": host, "domain": None, "allow": False, "deny": False, "weight": None, "name": None}
+        node = self._root
+        labels = host.split(".")
+        for i, label in enumerate(reversed(labels)):
+            node = node.get(label)
+            if node is None:
+                break
+            spec = node.get("")
+            if spec:
+                policy.update(spec)
+                policy["domain"] = ".".join(labels[len(labels) - 1 - i:])
+        return policy
+
+
+def load_domain_policy(path=DOMAINS_FILE):
+    with open(path, "r", encoding="utf-8") as f:
+        return DomainPolicyIndex(json.load(f))
@@ -7,16 +7,46 @@ import os
 import re
 import json
 import subprocess
+import threading
 import time
-import urllib.request
 import urllib.parse
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
 from urllib.parse import urlparse
 
+import convert
+from brave_search import get_scheduler
+from deadline import RunBudget
+from direct_entries import iter_direct_entries
+from stages import StageGraph
+from http_client import HTTPError, get_client
+from domain_policy import load_domain_policy
+from keyword_matcher import load_keyword_matcher
+from glossary import load_glossary
+from simhash import group_near_duplicates, simhash, title_fingerprint
+from text_clean import clean_text
+from translation_cache import TranslationCache, prompt_version
+from translation_triage import ROUTE_GLOSSARY, ROUTE_MODEL, ROUTE_SKIP, triage
+
 # 配置
 REPO_DIR = "/root/.openclaw/workspace/ai-daily"
 TODAY = datetime.now().strftime('%Y-%m-%d')
 NOW = datetime.now().strftime('%Y-%m-%d %H:%M')
+CACHE_DIR = os.path.join(REPO_DIR, ".cache")
+BRAVE_CACHE_PATH = os.path.join(CACHE_DIR, "brave-search.json")
+TRANSLATION_CACHE_PATH = os.path.join(CACHE_DIR, "translations.sqlite3")
+# 本次运行的时间预算与降级记录（update_log.py 读取后写进 logs/update-history.json）
+RUN_REPORT_PATH = os.path.join(REPO_DIR, "logs", "run-report.json")
+BUDGET = RunBudget()
+# HTTP 重试的退避等待不超过整次运行剩下的时间
+get_client().time_left = BUDGET.remaining
+
+# 新闻/工具启发式关键词（data/keywords.json），启动时编译一次
+KEYWORDS = load_keyword_matcher()
+# 域名策略（data/domains.json）：可信来源 / 排除 / 排序权重 / 来源名称
+DOMAINS = load_domain_policy()
+# 翻译术语表（data/glossary.json）
+GLOSSARY = load_glossary()
 def _load_env_from_secrets():
     p = "/root/.openclaw/workspace/.secrets/credentials.env"
     try:
@@ -39,114 +69,286 @@ if not DEEPSEEK_API_KEY:
     print("⚠️ DEEPSEEK_API_KEY not set; translations may fail")
 
 
-# DeepSeek翻译函数
-def translate_with_deepseek(text):
-    """使用DeepSeek API翻译为中文"""
-    if not text or len(text.strip()) < 5:
-        return text
-    
-    # 简单术语直接查词典（快速）
-    simple_trans = {
-        'AI': '人工智能',
-        'Artificial Intelligence': '人工智能',
-        'Machine Learning': '机器学习',
-        'Deep Learning': '深度学习',
-        'LLM': '大语言模型',
-        'OpenAI': 'OpenAI',
-        'Anthropic': 'Anthropic',
-        'Google': '谷歌',
-        'Microsoft': '微软',
-        'Reuters': '路透社',
-        'BBC': 'BBC',
-        'MIT': '麻省理工',
-        'TechCrunch': 'TechCrunch',
-        'NVIDIA': '英伟达',
-        'Meta': 'Meta',
-        'Amazon': '亚马逊',
-        'Apple': '苹果',
+# DeepSeek翻译
+DEEPSEEK_URL = "https://api.deepseek.com/chat/completions"
+DEEPSEEK_MODEL = "deepseek-chat"
+TRANSLATE_SYSTEM_PROMPT = "你是一个专业的AI科技新闻翻译。请将英文翻译成简洁的中文，保留专业术语的准确性。只需输出翻译结果，不要其他内容。"
+TRANSLATE_BATCH_PROMPT = (
+    "输入是一个 JSON 对象：{\"items\": [{\"id\": 整数, \"text\": 英文}]}。"
+    "请逐条翻译 text，输出 JSON：{\"items\": [{\"id\": 原样保留的 id, \"text\": 中文译文}]}。"
+    "每个 id 都要有且只有一条，不要合并、拆分或遗漏，不要输出 JSON 以外的内容。"
+)
+# 单条翻译的用户消息前缀 / 附在系统提示词后的术语表提示
+TRANSLATE_USER_PROMPT = "翻译这段英文新闻标题和摘要：\n\n"
+GLOSSARY_HINT_PROMPT = "\n术语表（原文=译文，请严格按此翻译）："
+# 单次批量请求最多带多少字符的原文（超出就拆成多次请求）
+TRANSLATE_BATCH_MAX_CHARS = 6000
+# 同时在途的翻译请求数 / 单次请求超时（秒）；批量请求输出长，超时单独放宽
+TRANSLATE_CONCURRENCY = int(os.environ.get("TRANSLATE_CONCURRENCY", "4") or 4)
+TRANSLATE_TIMEOUT = float(os.environ.get("TRANSLATE_TIMEOUT", "30") or 30)
+TRANSLATE_BATCH_TIMEOUT = float(os.environ.get("TRANSLATE_BATCH_TIMEOUT", "60") or 60)
+
+def _glossary_hint(*texts):
+    """把原文里出现的术语及译名附在系统提示词后面，模型和术语表保持同一套译名。"""
+    terms = GLOSSARY.terms_in("\n".join(texts))
+    if not terms:
+        return ""
+    return GLOSSARY_HINT_PROMPT + "；".join(f"{eng}={chi}" for eng, chi in terms)
+
+
+_triage_counts = {}
+_triage_lock = threading.Lock()
+
+
+def _triage_text(text, count=False):
+    """分流：skip 原样输出 / glossary 只查术语表 / model 调用模型；count=True 时计入本次运行的统计。"""
+    route, reason = triage(text, GLOSSARY)
+    if count:
+        # 按原来的门槛（> 30 字符且不是链接）会调用模型、现在分流掉的，算省下的调用
+        avoided = route != ROUTE_MODEL and len(text or "") > 30 and not text.startswith('http')
+        with _triage_lock:
+            _triage_counts[(route, reason)] = _triage_counts.get((route, reason), 0) + 1
+            if avoided:
+                _triage_counts["avoided"] = _triage_counts.get("avoided", 0) + 1
+    return route
+
+
+def _clean_translation(translated):
+    # 清理可能的引号
+    return re.sub(r'^["\']|["\']$', '', translated.strip())
+
+
+def _deepseek_chat(system, user, max_tokens=500, json_mode=False, timeout=TRANSLATE_TIMEOUT):
+    """调用 DeepSeek chat 接口，返回回复正文。"""
+    payload = {
+        "model": DEEPSEEK_MODEL,
+        "messages": [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ],
+        "max_tokens": max_tokens,
+        "temperature": 0.3,
     }
+    if json_mode:
+        payload["response_format"] = {"type": "json_object"}
+    headers = {'Authorization': f'Bearer {DEEPSEEK_API_KEY}'}
+    timeout = BUDGET.timeout("translate", timeout)
+    with get_client().post_json(DEEPSEEK_URL, payload, headers=headers, timeout=timeout) as response:
+        result_data = response.json()
+    return result_data['choices'][0]['message']['content'].strip()
+
+
+_translation_cache = None
+_translation_cache_lock = threading.Lock()
+
+
+def _get_translation_cache():
+    """翻译缓存（.cache/translations.sqlite3）；提示词版本取所有影响译文的提示词模板 + 术语表的哈希。"""
+    global _translation_cache
+    with _translation_cache_lock:
+        if _translation_cache is None:
+            _translation_cache = TranslationCache(
+                TRANSLATION_CACHE_PATH, DEEPSEEK_MODEL, prompt_version(
+                    TRANSLATE_SYSTEM_PROMPT, TRANSLATE_BATCH_PROMPT, TRANSLATE_USER_PROMPT,
+                    GLOSSARY_HINT_PROMPT, GLOSSARY.version))
+        return _translation_cache
+
+
+def translate_with_deepseek(text, check_cache=True):
+    """使用DeepSeek API翻译为中文
+
+    check_cache=False：调用方已经查过缓存（批量翻译漏掉条目的逐条补翻），不再重复查，
+    免得同一条原文记两次未命中。
+    """
+    route = _triage_text(text)
+    if route == ROUTE_SKIP:
+        return text
     
-    # 先做简单替换
-    result = text
-    for eng, chi in simple_trans.items():
-        result = re.sub(r'\b' + re.escape(eng) + r'\b', chi, result, flags=re.IGNORECASE)
+    # 先用术语表替换（一次扫描）
+    result = GLOSSARY.apply(text)
     
-    # 如果包含复杂句子，用DeepSeek翻译
-    if len(text) > 30 and not text.startswith('http'):
+    # 如果包含复杂句子，用DeepSeek翻译（先查缓存）
+    if route == ROUTE_MODEL:
+        cache = _get_translation_cache()
+        cached = cache.get(text) if check_cache else None
+        if cached is not None:
+            return cached
         try:
-            url = "https://api.deepseek.com/chat/completions"
-            payload = {
-                "model": "deepseek-chat",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "你是一个专业的AI科技新闻翻译。请将英文翻译成简洁的中文，保留专业术语的准确性。只需输出翻译结果，不要其他内容。"
-                    },
-                    {
-                        "role": "user",
-                        "content": f"翻译这段英文新闻标题和摘要：\n\n{text}"
-                    }
-                ],
-                "max_tokens": 500,
-                "temperature": 0.3
-            }
-            
-            data = json.dumps(payload).encode('utf-8')
-            req = urllib.request.Request(url, data=data, method='POST')
-            req.add_header('Content-Type', 'application/json')
-            req.add_header('Authorization', f'Bearer {DEEPSEEK_API_KEY}')
-            
-            with urllib.request.urlopen(req, timeout=30) as response:
-                result_data = json.loads(response.read().decode('utf-8'))
-                translated = result_data['choices'][0]['message']['content'].strip()
-                # 清理可能的引号
-                translated = re.sub(r'^["\']|["\']$', '', translated)
-                return translated
+            translated = _deepseek_chat(TRANSLATE_SYSTEM_PROMPT + _glossary_hint(text), TRANSLATE_USER_PROMPT + text)
+            translated = _clean_translation(translated)
+            cache.put(text, translated)
+            return translated
         except Exception as e:
             print(f"  翻译API调用失败: {e}")
             return result
     
     return result
 
-def clean_text(text):
-    """清理文本"""
-    if not text:
-        return ''
-    # 移除HTML标签
-    text = re.sub(r'<[^>]+>', '', text)
-    # 替换HTML实体
-    text = text.replace('&nbsp;', ' ').replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
-    text = text.replace('&#x27;', "'").replace('&#39;', "'").replace('&quot;', '"')
-    text = text.replace('&ldquo;', '"').replace('&rdquo;', '"').replace('&lsquo;', "'").replace('&rsquo;', "'")
-    # 移除多余空格和换行
-    text = re.sub(r'\s+', ' ', text).strip()
-    # 移除推广信息
-    text = re.sub(r'Subscribe.*', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'Register.*', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'Login.*', '', text, flags=re.IGNORECASE)
-    return text.strip()
+
+def _parse_batch_reply(content, ids):
+    """解析批量翻译回复，返回 {id: 译文}；缺失或格式不对的条目直接丢掉（由调用方逐条补翻）。"""
+    content = content.strip()
+    if content.startswith("```"):
+        content = re.sub(r'^```(?:json)?\s*|\s*```$', '', content)
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return {}
+    items = data.get("items") if isinstance(data, dict) else data
+    out = {}
+    for it in items if isinstance(items, list) else []:
+        if not isinstance(it, dict):
+            continue
+        try:
+            i = int(it.get("id"))
+        except (TypeError, ValueError):
+            continue
+        text = it.get("text")
+        if i in ids and isinstance(text, str) and text.strip():
+            out[i] = _clean_translation(text)
+    return out
+
+
+def _chunk_batch(pending):
+    """把 [(id, text)] 按字符数切成若干批。"""
+    chunk, size = [], 0
+    for i, text in pending:
+        if chunk and size + len(text) > TRANSLATE_BATCH_MAX_CHARS:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append((i, text))
+        size += len(text)
+    if chunk:
+        yield chunk
+
+
+def _translate_chunk(chunk):
+    """一批字符串一次请求翻完，返回 {id: 译文}。"""
+    ids = {i for i, _ in chunk}
+    body = json.dumps({"items": [{"id": i, "text": t} for i, t in chunk]}, ensure_ascii=False)
+    chars = sum(len(t) for _, t in chunk)
+    try:
+        content = _deepseek_chat(
+            TRANSLATE_SYSTEM_PROMPT + TRANSLATE_BATCH_PROMPT + _glossary_hint(*(t for _, t in chunk)),
+            body,
+            max_tokens=min(8000, 500 + chars * 2),
+            json_mode=True,
+            timeout=TRANSLATE_BATCH_TIMEOUT,
+        )
+    except Exception as e:
+        print(f"  批量翻译API调用失败: {e}")
+        return {}
+    return _parse_batch_reply(content, ids)
+
+
+_translate_pool = None
+_translate_pool_lock = threading.Lock()
+
+
+def _get_translate_pool():
+    """所有翻译请求共用一个有界线程池（TRANSLATE_CONCURRENCY 个并发）。"""
+    global _translate_pool
+    with _translate_pool_lock:
+        if _translate_pool is None:
+            _translate_pool = ThreadPoolExecutor(max_workers=max(1, TRANSLATE_CONCURRENCY),
+                                                 thread_name_prefix="translate")
+        return _translate_pool
+
+
+def submit_translations(texts):
+    """提交一组字符串的翻译，立即返回与 texts 一一对应的 Future 列表。
+
+    需要模型的字符串合并成批量请求，放进翻译线程池；批量回复里缺失/格式不对的条目
+    在回调里再逐条提交 translate_with_deepseek。调用方不用等，可以先去做别的事。
+    """
+    futs = [Future() for _ in texts]
+    cache = _get_translation_cache()
+    ids_by_text = {}
+    for i, text in enumerate(texts):
+        route = _triage_text(text, count=True)
+        if route == ROUTE_SKIP:
+            futs[i].set_result(text)
+        elif route == ROUTE_MODEL:
+            if text not in ids_by_text:
+                cached = cache.get(text)
+                if cached is not None:
+                    futs[i].set_result(cached)
+                    continue
+            ids_by_text.setdefault(text, []).append(i)
+        else:
+            futs[i].set_result(GLOSSARY.apply(text))
+    if not ids_by_text:
+        return futs
+    if BUDGET.expired("translate"):
+        for text, ids in ids_by_text.items():
+            for i in ids:
+                futs[i].set_result(GLOSSARY.apply(text))
+        BUDGET.degrade("translate", f"翻译阶段已超时，{len(ids_by_text)} 条只用术语表")
+        return futs
+
+    # 相同原文只翻一次；id 用去重后的序号
+    unique = list(ids_by_text)
+    pool = _get_translate_pool()
+
+    def deliver(k, value):
+        for i in ids_by_text[unique[k]]:
+            futs[i].set_result(value)
+
+    def on_single(k, f):
+        deliver(k, f.result() if f.exception() is None else GLOSSARY.apply(unique[k]))
+
+    def on_chunk(chunk, f):
+        got = f.result() if f.exception() is None else {}
+        missing = [k for k, _ in chunk if k not in got]
+        print(f"✓ 批量翻译: {len(chunk)} 条原文，{len(chunk) - len(missing)} 条一次请求完成")
+        if missing:
+            print(f"  批量翻译缺失 {len(missing)} 条，逐条补翻")
+        for k, _ in chunk:
+            if k in got:
+                cache.put(unique[k], got[k])
+                deliver(k, got[k])
+                continue
+            if BUDGET.expired("translate"):
+                # 没时间逐条补翻了，直接用术语表结果
+                deliver(k, GLOSSARY.apply(unique[k]))
+                continue
+            try:
+                pool.submit(translate_with_deepseek, unique[k], check_cache=False).add_done_callback(
+                    lambda f, k=k: on_single(k, f))
+            except RuntimeError:
+                # 进程正在退出，线程池不再接活
+                deliver(k, GLOSSARY.apply(unique[k]))
+
+    for chunk in _chunk_batch(list(enumerate(unique))):
+        pool.submit(_translate_chunk, chunk).add_done_callback(lambda f, chunk=chunk: on_chunk(chunk, f))
+    return futs
+
+
+def _collect_translations(futs, texts):
+    """等翻译结果，最多等到翻译阶段的截止时间；来不及的条目退回只用术语表。"""
+    out = []
+    late = 0
+    for f, text in zip(futs, texts):
+        try:
+            out.append(f.result(timeout=BUDGET.timeout("translate", None, floor=0.1)))
+        except FutureTimeoutError:
+            out.append(GLOSSARY.apply(text))
+            late += 1
+    if late:
+        BUDGET.degrade("translate", f"{late} 条翻译超时，只用术语表")
+    return out
+
 
 def get_source_name(url):
     """从URL提取来源"""
     if not url:
         return '未知来源'
     try:
-        parsed = urlparse(url)
-        source = parsed.netloc.replace('www.', '').split('/')[0]
-        # 常见来源映射
-        source_map = {
-            'reuters.com': '路透社',
-            'bbc.com': 'BBC',
-            'techcrunch.com': 'TechCrunch',
-            'mit.edu': '麻省理工',
-            'theverge.com': 'The Verge',
-            'wired.com': 'Wired',
-            'artificialintelligence-news.com': 'AI新闻',
-        }
-        for eng, chi in source_map.items():
-            if eng in source:
-                return chi
-        return source.split('.')[0].title()
+        policy = DOMAINS.lookup(url)
+        if policy["name"]:
+            return policy["name"]
+        # news.microsoft.com -> Microsoft（已收录的域名用收录的那一级命名）
+        return (policy["domain"] or policy["host"]).split('.')[0].title()
     except:
         return '未知来源'
 
@@ -161,63 +363,14 @@ def _parse_iso_dt(s: str):
 
 
 def _is_reputable_source(url: str) -> bool:
-    """Very conservative allowlist for '有效新闻' quality."""
+    """Very conservative allowlist for '有效新闻' quality (see data/domains.json)."""
     if not url:
         return False
-    host = urlparse(url).netloc.lower().replace("www.", "")
+    policy = DOMAINS.lookup(url)
+    return policy["allow"] and not policy["deny"]
 
-    # hard deny
-    if host.endswith("wikipedia.org"):
-        return False
-
-    allow = {
-        # mainstream tech/business
-        "reuters.com",
-        "bloomberg.com",
-        "ft.com",
-        "wsj.com",
-        "cnbc.com",
-        "axios.com",
-        "theverge.com",
-        "arstechnica.com",
-        "wired.com",
-        "techcrunch.com",
-        "venturebeat.com",
-        "spectrum.ieee.org",
-        "sfchronicle.com",
-        "pcmag.com",
-        "bbc.com",
-        "theguardian.com",
-        "nytimes.com",
-        "washingtonpost.com",
-        "economist.com",
-        "forbes.com",
-        "zdnet.com",
-        "tomshardware.com",
-        "semafor.com",
-        "theinformation.com",
-        # science
-        "nature.com",
-        "science.org",
-        "mit.edu",
-        # vendor / labs / official
-        "openai.com",
-        "anthropic.com",
-        "deepmind.google",
-        "blog.google",
-        "ai.google.dev",
-        "cloud.google.com",
-        "microsoft.com",
-        "nvidia.com",
-        "huggingface.co",
-        # ecosystem
-        "github.com",
-    }
 
-    return host in allow
-
-
-def _is_probable_homepage_or_section(url: str, title: str) -> bool:
+def _is_probable_homepage_or_section(url: str, title: str, hits=None) -> bool:
     """Reject non-article pages (homepages/sections/category indexes)."""
     try:
         p = urlparse(url)
@@ -245,84 +398,41 @@ def _is_probable_homepage_or_section(url: str, title: str) -> bool:
                 return True
 
         # generic “news hub” titles
-        if re.search(r"\b(latest|today|news)\b", t) and ("/" not in (p.path or "").strip("/")):
-            return True
+        if "/" not in (p.path or "").strip("/"):
+            if hits is None:
+                hits = KEYWORDS.scan(t)
+            if "hub_title" in hits:
+                return True
 
         return False
     except Exception:
         return False
 
 
-def _looks_like_real_news_item(title: str, desc: str) -> bool:
-    t = (title or "").lower()
-    d = (desc or "").lower()
+def _looks_like_real_news_item(title: str, desc: str, hits=None) -> bool:
+    """hits: 可选，KEYWORDS.scan(title, desc) 的结果（调用方已经扫过就直接复用）。"""
+    if hits is None:
+        hits = KEYWORDS.scan(title, desc)
 
     # avoid homepages/aggregators/SEO sludge
-    bad_patterns = [
-        r"\blatest news\b",
-        r"\bai news\b\s*\|",
-        r"\bhome\b",
-        r"\bnewsletter\b",
-        r"\bsubscribe\b",
-        r"\bregister\b",
-        r"\blogin\b",
-        r"\bpricing\b",
-        r"\bjobs\b",
-    ]
-    if any(re.search(p, t) for p in bad_patterns):
+    if "news_block" in hits:
         return False
 
     # require at least some "event" signal
-    signal_words = [
-        "launch",
-        "released",
-        "release",
-        "announces",
-        "announced",
-        "unveils",
-        "debut",
-        "funding",
-        "raises",
-        "acquires",
-        "acquisition",
-        "partnership",
-        "regulation",
-        "lawsuit",
-        "ban",
-        "policy",
-        "model",
-        "chip",
-        "gpu",
-        "security",
-        "openai",
-        "anthropic",
-        "google",
-        "microsoft",
-        "nvidia",
-        "deepseek",
-        "qwen",
-        "gemini",
-        "claude",
-    ]
-    blob = f"{t} {d}"
-    return any(w in blob for w in signal_words)
+    return "news_signal" in hits
 
 
 def _score_item(item: dict) -> float:
     """Cheap heuristic score: prioritize recency + reputable domains."""
     url = item.get("url", "")
     host = (item.get("meta_url") or {}).get("netloc", "")
-    host = (host or urlparse(url).netloc).lower().replace("www.", "")
+    policy = DOMAINS.lookup(host or url)
 
     # domain weights
     domain_boost = 0.0
-    if host in {"reuters.com", "bloomberg.com", "ft.com", "wsj.com"}:
-        domain_boost = 3.0
-    elif host in {"theverge.com", "arstechnica.com", "wired.com", "techcrunch.com", "axios.com", "cnbc.com"}:
-        domain_boost = 2.0
-    elif host in {"openai.com", "anthropic.com", "ai.google.dev", "cloud.google.com", "microsoft.com", "nvidia.com"}:
-        domain_boost = 2.5
-    elif host:
+    if policy["weight"] is not None:
+        domain_boost = policy["weight"]
+    elif policy["host"]:
         domain_boost = 0.5
 
     # recency: newer => higher
@@ -337,7 +447,104 @@ def _score_item(item: dict) -> float:
     return domain_boost + recency
 
 
-def search_news():
+# 候选分级：tier 0 = 严格（可信来源 + 像新闻 + 72h 内）；tier 1 = 放宽“新闻信号”；
+# tier 2 = 时效放宽到 7 天。按 (最大 tier, 数量上限) 依次填充，凑够 5 条就不再往下放宽。
+NEWS_MIN_ITEMS = 5
+NEWS_RECENT_HOURS = 72
+NEWS_BROADEN_HOURS = 168
+NEWS_TIER_PLAN = [(0, None), (1, 7), (2, 6)]
+# 近重复判定：标题+摘要 SimHash 指纹的汉明距离阈值（64 位）。
+# 同标题转载一般在 6~9 位，不相关的新闻在 25 位以上；索引表张数只随阈值变（8 -> 165 张），与条数无关
+NEWS_SIMHASH_DISTANCE = int(os.environ.get("NEWS_SIMHASH_DISTANCE", "8") or 8)
+
+
+def _build_news_candidates(results, now):
+    """Normalize every Brave result exactly once and assign it a selection tier.
+
+    Records that can never be selected (homepage, non-reputable, too old) get tier None.
+    """
+    records = []
+    for item in results:
+        title = clean_text(item.get('title', ''))
+        url_i = item.get('url', '')
+        if not title or not url_i:
+            continue
+        desc = clean_text(item.get('description', ''))
+        netloc = urlparse(url_i).netloc.lower()
+
+        page_age = _parse_iso_dt(item.get('page_age'))
+        age_hours = (now - page_age).total_seconds() / 3600 if page_age else None
+
+        hits = KEYWORDS.scan(title, desc)
+
+        rec = {
+            "item": item,
+            "title": title,
+            "desc": desc,
+            "url": url_i,
+            "netloc": netloc,
+            "age_hours": age_hours,
+            "is_homepage": _is_probable_homepage_or_section(url_i, title, hits),
+            "is_reputable": _is_reputable_source(url_i),
+            "is_news": _looks_like_real_news_item(title, desc, hits),
+            "tier": None,
+            "score": _score_item(item),
+        }
+
+        if not rec["is_homepage"] and rec["is_reputable"]:
+            # unknown age is kept (it will just score lower)
+            if age_hours is None or age_hours <= NEWS_RECENT_HOURS:
+                rec["tier"] = 0 if rec["is_news"] else 1
+            elif age_hours <= NEWS_BROADEN_HOURS:
+                rec["tier"] = 2
+        records.append(rec)
+    return records
+
+
+def _drop_near_duplicates(records):
+    """同一条新闻被多家转载时只留一条：SimHash 分组，组内保留 tier 最好、其次分数最高的那条。"""
+    fps = [simhash(r["title"], r["desc"]) for r in records]
+    groups = group_near_duplicates(fps, NEWS_SIMHASH_DISTANCE)
+    best = {}
+    for i, g in enumerate(groups):
+        j = best.get(g)
+        if j is None or (records[i]["tier"], -records[i]["score"]) < (records[j]["tier"], -records[j]["score"]):
+            best[g] = i
+    keep = set(best.values())
+    return [r for i, r in enumerate(records) if i in keep]
+
+
+def _select_news(results, now, history=None):
+    """Pick news items from merged Brave results in one classification sweep.
+
+    history: optional NewsHistory; stories published on earlier days are skipped.
+    """
+    records = [r for r in _build_news_candidates(results, now) if r["tier"] is not None]
+    if history is not None:
+        fresh = [r for r in records if not history.seen(r["url"], r["title"])]
+        if len(fresh) < len(records):
+            print(f"  跨天去重: 跳过 {len(records) - len(fresh)} 条前几天已发布的新闻")
+        records = fresh
+    records = _drop_near_duplicates(records)
+    filtered = []
+    seen = set()
+
+    for max_tier, cap in NEWS_TIER_PLAN:
+        if max_tier > 0 and len(filtered) >= NEWS_MIN_ITEMS:
+            break
+        for rec in records:
+            if rec["tier"] > max_tier:
+                continue
+            key = (re.sub(r"\W+", "", rec["title"].lower())[:80], rec["netloc"])
+            if key not in seen:
+                seen.add(key)
+                filtered.append(rec["item"])
+            if cap is not None and len(filtered) >= cap:
+                break
+    return filtered
+
+
+def search_news(history=None):
     """搜索AI新闻（并做筛选：近两天 + 可信来源 + 更像新闻的条目）"""
     print(f"🤖 AI Daily Generator - {TODAY}")
     print("📰 搜索AI新闻...")
@@ -358,121 +565,21 @@ def search_news():
     data = {"web": {"results": merged_results}}
 
     try:
-        for idx, q in enumerate(queries):
-            params = {"q": q, "count": 20, "freshness": "pd"}
-            url = "https://api.search.brave.com/res/v1/web/search?" + urllib.parse.urlencode(params)
-            req = urllib.request.Request(url, headers={
-                'Accept': 'application/json',
-                'X-Subscription-Token': BRAVE_API_KEY
-            })
-
-            # avoid 429 on Free plan (1 QPS)
-            if idx > 0:
-                time.sleep(1.2)
-
-            with urllib.request.urlopen(req, timeout=30) as response:
-                chunk = json.loads(response.read().decode('utf-8'))
-                merged_results.extend(((chunk.get('web', {}) or {}).get('results', [])) or [])
+        # 全部查询一次性交给共享调度器，由令牌桶控制 QPS（不再固定 sleep）
+        scheduler = get_scheduler(BRAVE_API_KEY, BRAVE_CACHE_PATH)
+        futures = [scheduler.submit({"q": q, "count": 20, "freshness": "pd"}) for q in queries]
+        for q, fut in zip(queries, futures):
+            try:
+                chunk = fut.result(timeout=BUDGET.timeout("search", None))
+            except FutureTimeoutError:
+                fut.cancel()
+                BUDGET.degrade("search", f"新闻查询超时，跳过：{q}")
+                continue
+            merged_results.extend(((chunk.get('web', {}) or {}).get('results', [])) or [])
 
         # Filter + rank in-place so the rest of the pipeline stays simple.
         results = merged_results
-        filtered = []
-        seen = set()
-
-        cutoff_hours = 72
-        now = datetime.now()
-
-        def recency_ok(item_):
-            page_age_ = _parse_iso_dt(item_.get('page_age'))
-            if not page_age_:
-                return True  # keep unknown, but will be scored lower
-            age_hours_ = (now - page_age_).total_seconds() / 3600
-            return age_hours_ <= cutoff_hours
-
-        def add_item(item_):
-            title_ = clean_text(item_.get('title', ''))
-            url_ = item_.get('url', '')
-            if not title_ or not url_:
-                return False
-            key_ = (re.sub(r"\W+", "", title_.lower())[:80], urlparse(url_).netloc.lower())
-            if key_ in seen:
-                return False
-            seen.add(key_)
-            filtered.append(item_)
-            return True
-
-        # Pass 1: strict (reputable + looks like news + recency)
-        for item in results:
-            title = clean_text(item.get('title', ''))
-            url_i = item.get('url', '')
-            desc = clean_text(item.get('description', ''))
-
-            if not title or not url_i:
-                continue
-            if not recency_ok(item):
-                continue
-            if _is_probable_homepage_or_section(url_i, title):
-                continue
-            if not _is_reputable_source(url_i):
-                continue
-            if not _looks_like_real_news_item(title, desc):
-                continue
-            add_item(item)
-
-        # Pass 2: relax "news signal" if we have too few
-        if len(filtered) < 5:
-            for item in results:
-                title = clean_text(item.get('title', ''))
-                url_i = item.get('url', '')
-                if not title or not url_i:
-                    continue
-                if not recency_ok(item):
-                    continue
-                if _is_probable_homepage_or_section(url_i, title):
-                    continue
-                if not _is_reputable_source(url_i):
-                    continue
-                add_item(item)
-                if len(filtered) >= 7:
-                    break
-
-        # Pass 3: last resort — still require reputable sources, only relax the "news signal".
-        if len(filtered) < 5:
-            for item in results:
-                title = clean_text(item.get('title', ''))
-                url_i = item.get('url', '')
-                if not title or not url_i:
-                    continue
-                if not recency_ok(item):
-                    continue
-                if _is_probable_homepage_or_section(url_i, title):
-                    continue
-                if not _is_reputable_source(url_i):
-                    continue
-                add_item(item)
-                if len(filtered) >= 7:
-                    break
-
-        # Pass 4: if still too few, broaden recency to 7 days (still reputable + not homepage)
-        if len(filtered) < 5:
-            broaden_hours = 168
-            for item in results:
-                title = clean_text(item.get('title', ''))
-                url_i = item.get('url', '')
-                if not title or not url_i:
-                    continue
-                page_age = _parse_iso_dt(item.get('page_age'))
-                if page_age:
-                    age_hours = (now - page_age).total_seconds() / 3600
-                    if age_hours > broaden_hours:
-                        continue
-                if _is_probable_homepage_or_section(url_i, title):
-                    continue
-                if not _is_reputable_source(url_i):
-                    continue
-                add_item(item)
-                if len(filtered) >= 6:
-                    break
+        filtered = _select_news(results, datetime.now(), history)
 
         filtered.sort(key=_score_item, reverse=True)
         data.setdefault('web', {})['results'] = filtered
@@ -482,8 +589,7 @@ def search_news():
     except Exception as e:
         # Try to print response body for HTTPError (useful for 422 debugging)
         try:
-            from urllib import error as urllib_error
-            if isinstance(e, urllib_error.HTTPError):
+            if isinstance(e, HTTPError):
                 body = e.read().decode('utf-8', errors='ignore')
                 print(f"搜索失败: HTTP {e.code} {e.reason}; body: {body[:300]}")
                 return None
@@ -509,31 +615,143 @@ def _save_json(path: str, obj):
         pass
 
 
+# 工具页直达链接解析：并发数 / 每个查询最多解析几个页面 / 每页最多下载多少字节
+RESOLVE_WORKERS = 4
+RESOLVE_BUDGET_PER_QUERY = 6
+RESOLVE_MAX_BYTES = 600000
+
+# 文章 URL -> 直达链接 的持久缓存（负结果也缓存，但过期更快）
+RESOLVE_CACHE_TTL = float(os.environ.get("RESOLVE_CACHE_TTL_DAYS", "30") or 30) * 86400
+RESOLVE_CACHE_NEGATIVE_TTL = float(os.environ.get("RESOLVE_CACHE_NEGATIVE_TTL_DAYS", "3") or 3) * 86400
+RESOLVE_CACHE_MAX_ENTRIES = 3000
+
+
+# 跨天新闻去重：记录已发布新闻的规范化 URL 和标题指纹
+NEWS_HISTORY_DAYS = float(os.environ.get("NEWS_HISTORY_DAYS", "14") or 14)
+NEWS_HISTORY_MAX_ENTRIES = 2000
+_TRACKING_PARAMS = {"ref", "fbclid", "gclid", "guccounter", "mc_cid", "mc_eid", "cmpid", "smid"}
+
+
+def _canonical_url(url: str) -> str:
+    """scheme/host 小写、去 www.、去掉 utm_* 等跟踪参数、fragment 和末尾的 /。"""
+    p = urlparse(url or "")
+    host = p.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = [
+        (k, v) for k, v in urllib.parse.parse_qsl(p.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ]
+    path = (p.path or "").rstrip("/")
+    out = f"{host}{path}"
+    if query:
+        out += "?" + urllib.parse.urlencode(query)
+    return out
+
+
+class NewsHistory:
+    """Persistent 'seen news' index (news_history.json).
+
+    Entries from the current edition date are ignored by seen() so a same-day rerun
+    can pick the same stories again.
+    """
+
+    def __init__(self, path: str, today: str = TODAY):
+        self.path = path
+        self.today = today
+        data = _load_json(path, {})
+        self._urls = dict(data.get("urls") or {}) if isinstance(data, dict) else {}
+        self._titles = dict(data.get("titles") or {}) if isinstance(data, dict) else {}
+        self._prune()
+
+    def _prune(self):
+        cutoff = time.time() - NEWS_HISTORY_DAYS * 86400
+        for index in (self._urls, self._titles):
+            live = sorted(((k, v) for k, v in index.items() if v.get("ts", 0) >= cutoff), key=lambda kv: kv[1]["ts"])
+            index.clear()
+            index.update(live[-NEWS_HISTORY_MAX_ENTRIES:])
+
+    def _seen_in(self, index, key):
+        entry = index.get(key) if key else None
+        return entry is not None and entry.get("date") != self.today
+
+    def seen(self, url: str, title: str) -> bool:
+        return self._seen_in(self._urls, _canonical_url(url)) or self._seen_in(self._titles, title_fingerprint(title))
+
+    def record(self, url: str, title: str):
+        entry = {"date": self.today, "ts": time.time()}
+        self._urls[_canonical_url(url)] = entry
+        fp = title_fingerprint(title)
+        if fp:
+            self._titles[fp] = dict(entry)
+
+    def save(self):
+        """tmp 文件 + os.replace，写到一半崩溃也不会留下半个 JSON。"""
+        self._prune()
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"urls": self._urls, "titles": self._titles}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print(f"  新闻历史写入失败: {e}")
+
+
+class ResolveCache:
+    """Persistent article URL -> direct entry URL map (None = page had no usable link)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        data = _load_json(path, {})
+        entries = data.get("entries") if isinstance(data, dict) else None
+        self._entries = entries if isinstance(entries, dict) else {}
+
+    def _expired(self, entry, now):
+        ttl = RESOLVE_CACHE_TTL if entry.get("direct") else RESOLVE_CACHE_NEGATIVE_TTL
+        return now - entry.get("ts", 0) > ttl
+
+    def lookup(self, url: str):
+        """Return (hit, direct_url)."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None and not self._expired(entry, time.time()):
+                self.hits += 1
+                return True, entry.get("direct")
+            self.misses += 1
+            return False, None
+
+    def store(self, url: str, direct):
+        with self._lock:
+            self._entries[url] = {"direct": direct, "ts": time.time()}
+
+    def save(self):
+        now = time.time()
+        with self._lock:
+            live = {u: e for u, e in self._entries.items() if not self._expired(e, now)}
+            # 超出容量时保留最近解析的条目
+            if len(live) > RESOLVE_CACHE_MAX_ENTRIES:
+                newest = sorted(live.items(), key=lambda kv: kv[1].get("ts", 0))[-RESOLVE_CACHE_MAX_ENTRIES:]
+                live = dict(newest)
+            self._entries = live
+            _save_json(self.path, {"entries": live})
+
+
 def _is_probable_tool_page(url: str, title: str, desc: str) -> bool:
     """Heuristic for tool-type pages.
 
     Plan B is noisy; prioritize "not spam" over "perfectly new".
     """
-    t = (title or "").lower()
-    d = (desc or "").lower()
-    blob = t + " " + d
+    hits = KEYWORDS.scan(title, desc)
 
     # reject obvious listicles / SEO sludge
-    bad = [
-        "best ai tools",
-        "top ai tools",
-        "ultimate guide",
-        "list of",
-        "coupon",
-        "discount",
-        "affiliat",
-    ]
-    if any(b in blob for b in bad):
+    if "tool_spam" in hits:
         return False
 
     # must at least look AI/dev related
-    must = ["ai", "llm", "agent", "rag", "open source", "github", "model", "prompt", "inference", "copilot", "coding"]
-    if not any(m in blob for m in must):
+    if "tool_must" not in hits:
         return False
 
     return True
@@ -551,6 +769,7 @@ def search_tools():
 
     history_path = os.path.join(REPO_DIR, "tools_history.json")
     history = _load_json(history_path, {"recent": []})
+    resolve_cache = ResolveCache(os.path.join(REPO_DIR, "tools_resolve_cache.json"))
     recent = set(history.get("recent", [])[-80:])
 
     # Query set: bias toward *direct entry points* (repo/package/spaces/models).
@@ -565,39 +784,17 @@ def search_tools():
         "Hugging Face new model release",
     ]
 
-    deny_hosts = {
-        # social / forums / noisy
-        "reddit.com", "www.reddit.com",
-        "news.ycombinator.com",
-        "medium.com",
-        "substack.com",
-        "dev.to",
-        "discuss.huggingface.co",
-        # rumor / low-signal sites
-        "llmrumors.com", "www.llmrumors.com",
-        # download farms / aggregators
-        "uptodown.com", "ollama.en.uptodown.com",
-        # generic social
-        "pinterest.com", "facebook.com", "twitter.com", "x.com", "instagram.com", "tiktok.com",
-        # news/report-only (not direct tool entry)
-        "itbrief.com.au", "itbrief.asia", "itbrief.com.au",
-        "techedubyte.com", "www.techedubyte.com",
-        "itbrief.com.au",
-    }
-
     def is_bad_tool_page(url_i: str, title: str, desc: str) -> bool:
         p = urlparse(url_i)
         host = p.netloc.lower().replace("www.", "")
         path = (p.path or "").lower()
-        blob = (title + " " + desc).lower()
 
         # listicles / roundups / guides
-        bad_words = ["best ", "top ", "ultimate", "definitive", "guide", "list of", "alternatives", "reviews", "pricing"]
-        if any(w in blob for w in bad_words):
+        if "tool_listicle" in KEYWORDS.scan(title, desc):
             return True
 
         # forums / threads
-        if any(x in path for x in ["/forum", "/forums", "/thread", "/threads", "/discussion", "/discuss"]):
+        if "forum_path" in KEYWORDS.scan(path):
             return True
 
         # producthunt category/review/alternatives etc.
@@ -632,126 +829,143 @@ def search_tools():
         # For 'direct entry' mode, reject unknown hosts.
         return False
 
-    def _extract_direct_entries_from_html(html: str):
-        """Return list of direct entry URLs found in an article page."""
-        if not html:
-            return []
-        urls = []
-        patterns = [
-            r"https?://github\.com/[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+",
-            r"https?://pypi\.org/project/[A-Za-z0-9_.-]+/?",
-            r"https?://www\.npmjs\.com/package/[A-Za-z0-9_.@/-]+",
-            r"https?://huggingface\.co/spaces/[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+",
-            r"https?://huggingface\.co/models/[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+",
-        ]
-        for pat in patterns:
-            for m in re.findall(pat, html):
-                urls.append(m.rstrip("/"))
-        # de-dupe keep order
-        out = []
-        seen_u = set()
-        for u in urls:
-            if u not in seen_u:
-                seen_u.add(u)
-                out.append(u)
-        return out
-
     def _try_resolve_to_direct_entry(url_i: str):
-        """If url_i is not a direct entry, try to fetch and extract a direct-entry link."""
+        """If url_i is not a direct entry, try to fetch and extract a direct-entry link.
+
+        边下载边扫描：找到第一个合格的直达链接就返回，剩下的页面不再下载（连接直接关闭）。
+        结果（包括“没找到”）写入 resolve_cache；网络错误不缓存，下次还会重试。
+        """
         try:
-            req2 = urllib.request.Request(url_i, headers={
+            direct = None
+            with get_client().get(url_i, headers={
                 "User-Agent": "Mozilla/5.0",
                 "Accept": "text/html,application/xhtml+xml",
-            })
-            with urllib.request.urlopen(req2, timeout=15) as resp2:
+            }, timeout=BUDGET.timeout("resolve", 15)) as resp2:
                 ctype = resp2.headers.get("Content-Type", "")
-                if "text/html" not in ctype:
-                    return None
-                html = resp2.read(600000).decode("utf-8", errors="ignore")
-            candidates = _extract_direct_entries_from_html(html)
-            for c in candidates:
-                if looks_like_tool_artifact(c):
-                    return c
+                if "text/html" in ctype:
+                    for c in iter_direct_entries(resp2.iter_text(limit=RESOLVE_MAX_BYTES)):
+                        if looks_like_tool_artifact(c):
+                            direct = c
+                            break
         except Exception:
             return None
-        return None
+        resolve_cache.store(url_i, direct)
+        return direct
 
     picked = []
     seen = set()
 
-    for i, q in enumerate(queries):
-        if len(picked) >= 3:
-            break
-        if i > 0:
-            time.sleep(1.2)  # Brave free plan: 1 QPS
-
-        params = {"q": q, "count": 20, "freshness": "pw"}
-        url = "https://api.search.brave.com/res/v1/web/search?" + urllib.parse.urlencode(params)
-        req = urllib.request.Request(url, headers={
-            'Accept': 'application/json',
-            'X-Subscription-Token': BRAVE_API_KEY
-        })
+    # 查询全部提前提交，按顺序消费；凑够 3 个后取消还没发出的请求，不浪费配额。
+    scheduler = get_scheduler(BRAVE_API_KEY, BRAVE_CACHE_PATH)
+    futures = [scheduler.submit({"q": q, "count": 20, "freshness": "pw"}) for q in queries]
+    resolve_pool = ThreadPoolExecutor(max_workers=RESOLVE_WORKERS)
+    resolve_skipped = 0
 
-        try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                data = json.loads(response.read().decode('utf-8'))
-        except Exception:
-            continue
+    try:
+        for q, fut in zip(queries, futures):
+            if len(picked) >= 3:
+                break
 
-        # limit how many pages we fetch for resolving (avoid being slow)
-        resolve_budget = 3
+            try:
+                data = fut.result(timeout=BUDGET.timeout("search", None))
+            except FutureTimeoutError:
+                BUDGET.degrade("search", f"工具查询超时，只用已选出的 {len(picked)} 个工具")
+                break
+            except Exception as e:
+                # 重试/熔断都在 http_client 里做过了，这里只记一笔，换下一个查询
+                print(f"  工具查询失败（{q}）: {e}")
+                continue
 
-        for item in (data.get('web', {}) or {}).get('results', []):
-            title = clean_text(item.get('title', ''))
-            url_i = item.get('url', '')
-            desc = clean_text(item.get('description', ''))
+            # 先做廉价过滤；需要抓页面解析的候选一次性提交给线程池并行解析，
+            # 再按原始顺序取结果，保证挑选顺序和串行时一致。
+            candidates = []
+            resolve_budget = RESOLVE_BUDGET_PER_QUERY
 
-            if not title or not url_i:
-                continue
+            for item in (data.get('web', {}) or {}).get('results', []):
+                title = clean_text(item.get('title', ''))
+                url_i = item.get('url', '')
+                desc = clean_text(item.get('description', ''))
+
+                if not title or not url_i:
+                    continue
 
-            host = (item.get('meta_url') or {}).get('netloc') or urlparse(url_i).netloc
-            host = (host or "").lower().replace("www.", "")
+                host = (item.get('meta_url') or {}).get('netloc') or url_i
 
-            if host in deny_hosts:
-                continue
-            if url_i in recent:
-                continue
-            if _is_probable_homepage_or_section(url_i, title):
-                continue
-            if is_bad_tool_page(url_i, title, desc):
-                continue
+                # social / forums / download farms / news-only sites (data/domains.json)
+                if DOMAINS.lookup(host)["deny"]:
+                    continue
+                if url_i in recent:
+                    continue
+                if _is_probable_homepage_or_section(url_i, title):
+                    continue
+                if is_bad_tool_page(url_i, title, desc):
+                    continue
 
-            direct_url = url_i if looks_like_tool_artifact(url_i) else None
-            if not direct_url and resolve_budget > 0:
-                resolve_budget -= 1
-                direct_url = _try_resolve_to_direct_entry(url_i)
+                if looks_like_tool_artifact(url_i):
+                    candidates.append((item, title, desc, url_i, None))
+                    continue
 
-            if not direct_url:
-                continue
-            if direct_url in recent:
-                continue
+                # 以前解析过的文章直接用缓存结果，不占解析预算
+                hit, cached_direct = resolve_cache.lookup(url_i)
+                if hit:
+                    done = Future()
+                    done.set_result(cached_direct)
+                    candidates.append((item, title, desc, url_i, done))
+                elif resolve_budget > 0:
+                    if BUDGET.expired("resolve"):
+                        # 解析阶段没时间了：只用本身就是直达链接的候选
+                        resolve_skipped += 1
+                        continue
+                    resolve_budget -= 1
+                    candidates.append((item, title, desc, url_i, resolve_pool.submit(_try_resolve_to_direct_entry, url_i)))
 
-            # cheap de-dupe
-            key = (direct_url,)
-            if key in seen:
-                continue
-            seen.add(key)
+            for item, title, desc, url_i, resolve_fut in candidates:
+                if len(picked) >= 3:
+                    break
 
-            date = None
-            dt = _parse_iso_dt(item.get("page_age"))
-            if dt:
-                date = dt.strftime("%Y-%m-%d")
+                try:
+                    direct_url = resolve_fut.result(timeout=BUDGET.timeout("resolve", None)) if resolve_fut else url_i
+                except FutureTimeoutError:
+                    resolve_skipped += 1
+                    continue
 
-            picked.append({
-                "name": title,
-                "url": direct_url,
-                "desc": desc,
-                "source": get_source_name(url_i),
-                "date": date,
-            })
+                if not direct_url:
+                    continue
+                if direct_url in recent:
+                    continue
 
-            if len(picked) >= 3:
-                break
+                # cheap de-dupe
+                key = (direct_url,)
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                date = None
+                dt = _parse_iso_dt(item.get("page_age"))
+                if dt:
+                    date = dt.strftime("%Y-%m-%d")
+
+                picked.append({
+                    "name": title,
+                    "url": direct_url,
+                    "desc": desc,
+                    "source": get_source_name(url_i),
+                    "date": date,
+                })
+
+            for c in candidates:
+                if c[4] is not None:
+                    c[4].cancel()
+    finally:
+        resolve_pool.shutdown(wait=False, cancel_futures=True)
+
+    for fut in futures:
+        fut.cancel()
+
+    if resolve_skipped:
+        BUDGET.degrade("resolve", f"解析超时，跳过 {resolve_skipped} 个需要解析的候选")
+    resolve_cache.save()
+    print(f"✓ 直达链接缓存: 命中 {resolve_cache.hits}，未命中 {resolve_cache.misses}")
 
     if picked:
         history.setdefault("recent", [])
@@ -762,62 +976,174 @@ def search_tools():
     return picked
 
 
-def generate_daily():
-    """生成日报"""
-    data = search_news()
-    
+def _log_brave_cache_stats():
+    cache = get_scheduler().cache
+    if cache is None:
+        return
+    st = cache.stats()
+    total = st["hits"] + st["misses"]
+    rate = (st["hits"] / total * 100) if total else 0.0
+    print(f"✓ Brave 缓存: 命中 {st['hits']} / 未命中 {st['misses']}（命中率 {rate:.0f}%，缓存 {st['entries']} 条）")
+
+
+def _log_translation_cache_stats():
+    cache = _get_translation_cache()
+    evicted = cache.evict()
+    st = cache.stats()
+    print(f"✓ 翻译缓存: 命中 {st['hits']} / 未命中 {st['misses']}（命中率 {st['hit_rate'] * 100:.0f}%，"
+          f"新写入 {st['writes']}，淘汰 {evicted}，缓存 {st['entries']} 条）")
+
+
+_TRIAGE_LABELS = {
+    ROUTE_SKIP: "跳过", ROUTE_GLOSSARY: "术语表", ROUTE_MODEL: "模型",
+    "short": "短串", "url": "链接", "chinese": "已是中文", "identifiers": "代码/标识符",
+    "names": "已知名称", "sentence": "句子", "japanese_korean": "日文/韩文",
+}
+
+
+def _log_triage_stats():
+    with _triage_lock:
+        counts = dict(_triage_counts)
+    avoided = counts.pop("avoided", 0)
+    parts = []
+    for route in (ROUTE_SKIP, ROUTE_GLOSSARY, ROUTE_MODEL):
+        reasons = {r: n for (rt, r), n in counts.items() if rt == route}
+        total = sum(reasons.values())
+        detail = "、".join(f"{_TRIAGE_LABELS.get(r, r)} {n}" for r, n in sorted(reasons.items()))
+        parts.append(f"{_TRIAGE_LABELS[route]} {total}" + (f"（{detail}）" if detail else ""))
+    print(f"✓ 翻译分流: {' / '.join(parts)}，省掉 {avoided} 次模型调用")
+
+
+def _translate_news(data):
+    """新闻条目一选出来就翻译（不等工具搜索）。"""
+    news_entries = []
+    if data and 'web' in data:
+        for item in data.get('web', {}).get('results', [])[:5]:
+            title = clean_text(item.get('title', ''))
+            url = item.get('url', '')
+            desc = clean_text(item.get('description', ''))
+            if title and url:
+                news_entries.append({"title": title, "url": url, "desc": desc, "source": get_source_name(url)})
+    news_texts = [t for e in news_entries for t in (e["title"], e["desc"])]
+    news_cn = _collect_translations(submit_translations(news_texts), news_texts)
+    for n, e in enumerate(news_entries):
+        e["title_cn"], e["desc_cn"] = news_cn[2 * n], news_cn[2 * n + 1]
+    return news_entries
+
+
+def _translate_tools(tool_items):
+    """工具推荐（方案B：动态抓新品/更新）拿到后立即翻译。"""
+    tool_entries = []
+    for t in (tool_items or [])[:3]:
+        url = t.get("url") or ""
+        tool_entries.append({
+            "name": t.get("name") or t.get("title") or "(未命名工具)",
+            "url": url,
+            "desc": t.get("desc") or "",
+            "source": t.get("source") or get_source_name(url),
+            "date": t.get("date"),
+        })
+    tool_texts = [t for e in tool_entries for t in (e["name"], e["desc"])]
+    tool_cn = _collect_translations(submit_translations(tool_texts), tool_texts)
+    for n, e in enumerate(tool_entries):
+        e["name_cn"], e["desc_cn"] = tool_cn[2 * n], tool_cn[2 * n + 1]
+    return tool_entries
+
+
+def _add_daily_stages(graph):
+    """日报相关的阶段：新闻搜索 → 新闻翻译、工具搜索 → 工具翻译（两条线并行），最后写 markdown。"""
+    news_history = NewsHistory(os.path.join(REPO_DIR, "news_history.json"))
+    graph.add("news_search", lambda: search_news(news_history))
+    graph.add("tools_search", search_tools)
+    graph.add("news_translate", lambda news_search: _translate_news(news_search), deps=("news_search",))
+    graph.add("tools_translate", lambda tools_search: _translate_tools(tools_search), deps=("tools_search",))
+    graph.add("write_markdown",
+              lambda news_translate, tools_translate: _write_daily(news_translate, tools_translate, news_history),
+              deps=("news_translate", "tools_translate"))
+    return graph
+
+
+def _build_edition(news_entries, tool_entries, generated_at):
+    """daily/<date>.json 的内容：与 markdown 同一份数据，字段化。"""
+    return {
+        "version": 1,
+        "date": TODAY,
+        "title": f"AI Daily · {TODAY}",
+        "generated_at": generated_at,
+        "news": [
+            {
+                "title": e["title_cn"],
+                "title_en": e["title"],
+                "url": e["url"],
+                "source": e["source"],
+                "summary": e["desc_cn"] if e["desc"] else "",
+            }
+            for e in news_entries
+        ],
+        "tools": [
+            {
+                "name": e["name_cn"],
+                "name_en": e["name"],
+                "url": e["url"],
+                "source": e["source"],
+                "date": e["date"],
+                "desc": e["desc_cn"],
+            }
+            for e in tool_entries
+        ],
+    }
+
+
+def _write_edition(news_entries, tool_entries, generated_at):
+    edition = _build_edition(news_entries, tool_entries, generated_at)
+    path = os.path.join(REPO_DIR, 'daily', f'{TODAY}.json')
+    tmp = path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(edition, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+    print(f"✓ 结构化日报: {path}")
+    return edition
+
+
+def _write_daily(news_entries, tool_entries, news_history):
+    """按固定顺序写 markdown + JSON + 更新 README，返回 {"md_file": 日报路径, "edition": 结构化日报}。"""
+    _log_brave_cache_stats()
+    _log_triage_stats()
+    _log_translation_cache_stats()
+
     md_file = os.path.join(REPO_DIR, 'daily', f'{TODAY}.md')
-    
+    generated_at = f"{TODAY} {datetime.now().strftime('%H:%M')}"
+
     with open(md_file, 'w', encoding='utf-8') as f:
         f.write(f"# AI Daily · {TODAY}\n\n")
-        f.write(f"日期: {TODAY} {datetime.now().strftime('%H:%M')}\n\n")
+        f.write(f"日期: {generated_at}\n\n")
         
         # 今日新闻
         f.write("## 📰 今日新闻\n\n")
         
-        if data and 'web' in data:
-            for item in data.get('web', {}).get('results', [])[:5]:
-                title = clean_text(item.get('title', ''))
-                url = item.get('url', '')
-                desc = clean_text(item.get('description', ''))
-                
-                if title and url:
-                    # 使用DeepSeek翻译标题
-                    title_cn = translate_with_deepseek(title)
-                    
-                    source = get_source_name(url)
-                    
-                    f.write(f"### {title_cn}\n\n")
-                    f.write(f"来源: [{source}]({url})\n\n")
-                    if desc:
-                        # 使用DeepSeek翻译描述
-                        desc_cn = translate_with_deepseek(desc)
-                        f.write(f"{desc_cn}\n\n")
-                    f.write(f"[阅读原文]({url})\n\n")
-                    f.write("---\n\n")
+        for e in news_entries:
+            url = e["url"]
+            f.write(f"### {e['title_cn']}\n\n")
+            f.write(f"来源: [{e['source']}]({url})\n\n")
+            if e["desc"]:
+                f.write(f"{e['desc_cn']}\n\n")
+            f.write(f"[阅读原文]({url})\n\n")
+            f.write("---\n\n")
+            news_history.record(url, e["title"])
         
         # 工具推荐（方案B：动态抓新品/更新）
         f.write("## 🛠️ 工具推荐\n\n")
 
-        tool_items = search_tools()
-        if tool_items:
-            for t in tool_items[:3]:
-                name = t.get("name") or t.get("title") or "(未命名工具)"
-                url = t.get("url") or ""
-                desc = t.get("desc") or ""
-                source = t.get("source") or get_source_name(url)
-                date = t.get("date")
-
-                name_cn = translate_with_deepseek(name)
-                desc_cn = translate_with_deepseek(desc) if desc else ""
-
-                f.write(f"### {name_cn}\n\n")
-                if date:
-                    f.write(f"来源: [{source}]({url})｜日期: {date}\n\n")
+        if tool_entries:
+            for e in tool_entries:
+                url = e["url"]
+                f.write(f"### {e['name_cn']}\n\n")
+                if e["date"]:
+                    f.write(f"来源: [{e['source']}]({url})｜日期: {e['date']}\n\n")
                 else:
-                    f.write(f"来源: [{source}]({url})\n\n")
-                if desc_cn:
-                    f.write(f"{desc_cn}\n\n")
+                    f.write(f"来源: [{e['source']}]({url})\n\n")
+                if e["desc_cn"]:
+                    f.write(f"{e['desc_cn']}\n\n")
                 f.write(f"[访问]({url})\n\n")
                 f.write("---\n\n")
         else:
@@ -831,6 +1157,9 @@ def generate_daily():
         f.write(f"- [{TODAY}](./{TODAY}.html)\n")
     
     print(f"✓ 创建日报: {md_file}")
+
+    # 同名的结构化版本：convert.py 直接用它生成卡片，不再从 markdown 反推
+    edition = _write_edition(news_entries, tool_entries, generated_at)
     
     # 更新README
     readme_file = os.path.join(REPO_DIR, 'README.md')
@@ -845,18 +1174,30 @@ def generate_daily():
         with open(readme_file, 'w', encoding='utf-8') as f:
             f.write(content)
         print("✓ 更新README")
+
+    # 日报写完才落盘，失败的运行不会污染历史
+    news_history.save()
     
-    return md_file
+    return {"md_file": md_file, "edition": edition}
+
+def generate_html(edition=None):
+    """生成HTML（进程内调用 convert.build，不再另起解释器）。
 
-def generate_html():
-    """生成HTML"""
+    edition 是刚写好的当天结构化日报，直接交给 convert 渲染，不用再读回 JSON。
+    渲染阶段已经超时的话只重建首页和当天页面，其余历史页面沿用上次的结果。
+    """
     print("🔄 生成HTML页面...")
-    convert_script = os.path.join(REPO_DIR, 'convert.py')
-    result = subprocess.run(['python3', convert_script], capture_output=True, text=True)
-    if result.returncode == 0:
-        print("✓ 生成HTML页面")
-    else:
-        print(f"✗ HTML生成失败: {result.stderr}")
+    editions = {TODAY: edition} if edition else None
+    pages = None
+    if BUDGET.expired("render"):
+        pages = [TODAY]
+        BUDGET.degrade("render", "渲染时间不够，只重建首页和当天页面")
+    try:
+        convert.build(REPO_DIR, pages=pages, editions=editions)
+    except Exception as e:
+        print(f"✗ HTML生成失败: {e}")
+        return
+    print("✓ 生成HTML页面")
 
 def commit_and_push():
     """提交并推送"""
@@ -883,12 +1224,38 @@ def commit_and_push():
     else:
         print("✓ 无新内容，跳过提交")
 
+def _write_run_report():
+    """把时间预算和降级记录写到 logs/run-report.json，由 update_log.py 合并进更新日志。"""
+    report = dict(BUDGET.report(), date=TODAY, finished_at=datetime.now().astimezone().isoformat())
+    _save_json(RUN_REPORT_PATH, report)
+    if report["degradations"]:
+        print(f"⏱️ 用时 {report['elapsed_seconds']}s / 预算 {report['deadline_seconds']:.0f}s，降级 {len(report['degradations'])} 项")
+    elif BUDGET.enabled:
+        print(f"⏱️ 用时 {report['elapsed_seconds']}s / 预算 {report['deadline_seconds']:.0f}s")
+
+
 def main():
+    BUDGET.start()
     print("=" * 40)
-    md_file = generate_daily()
-    generate_html()
-    commit_and_push()
+    # 日报阶段 → 渲染 → 推送；日报内部的新闻线和工具线并行
+    graph = _add_daily_stages(StageGraph())
+    graph.add("render_html", lambda write_markdown: generate_html(write_markdown["edition"]), deps=("write_markdown",))
+    graph.add("publish", lambda render_html: commit_and_push(), deps=("render_html",))
+    try:
+        graph.run()
+    finally:
+        print("⏲️ 阶段耗时:")
+        print(graph.format_timings())
     print("=" * 40)
+    conn_stats = get_client().format_stats()
+    if conn_stats:
+        print("🔌 HTTP 连接复用统计:")
+        print(conn_stats)
+    resilience = get_client().format_resilience()
+    if resilience:
+        print("🛡️ 重试 / 熔断:")
+        print(resilience)
+    _write_run_report()
     print(f"🎉 AI日报生成完成！")
     print(f"📅 日期: {TODAY}")
 
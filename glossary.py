@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""翻译术语表：启动时从 data/glossary.json 编译成一个正则，一次扫描完成全部替换"""
+
+import hashlib
+import json
+import os
+import re
+
+GLOSSARY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "glossary.json")
+
+# 去掉术语后只剩这些字符，就认为整句已被术语表覆盖，不用再问模型
+_LEFTOVER_RE = re.compile(r"[\W\d_]+")
+
+
+class Glossary:
+    """英文术语 -> 中文译名。
+
+    所有术语按长度倒序拼成一个整词、不区分大小写的正则，长词优先
+    （"Generative AI" 不会先被 "AI" 吃掉）。version 是术语表内容的哈希，
+    写进翻译缓存的提示词版本里，术语一改旧译文就失效。
+    """
+
+    def __init__(self, terms, names=()):
+        self.terms = {}
+        # names：已知的产品/项目名，原样保留（译文 = 原文）
+        pairs = [(n, n) for n in names] + list(terms.items())
+        for eng, chi in pairs:
+            eng = " ".join(str(eng).split())
+            if eng:
+                self.terms[eng.lower()] = (eng, str(chi))
+        names = sorted(self.terms, key=len, reverse=True)
+        body = "|".join(re.escape(n).replace(r"\ ", r"\s+") for n in names)
+        self._re = re.compile(r"\b(?:" + body + r")\b", re.IGNORECASE) if names else None
+        blob = json.dumps(sorted(self.terms.values()), ensure_ascii=False)
+        self.version = hashlib.blake2b(blob.encode("utf-8"), digest_size=6).hexdigest()
+
+    def _lookup(self, m):
+        return self.terms[" ".join(m.group().lower().split())]
+
+    def apply(self, text):
+        """一次扫描把所有术语替换成译名。"""
+        if not text or self._re is None:
+            return text
+        return self._re.sub(lambda m: self._lookup(m)[1], text)
+
+    def terms_in(self, text):
+        """text 里出现的术语 [(英文, 中文)]，按首次出现顺序去重（传给模型保证译名一致）。"""
+        if not text or self._re is None:
+            return []
+        found = {}
+        for m in self._re.finditer(text):
+            eng, chi = self._lookup(m)
+            found.setdefault(eng, chi)
+        return list(found.items())
+
+    def covers(self, text):
+        """去掉术语、数字和标点后什么都不剩（如纯品牌名），术语表就能翻完。"""
+        if not text or self._re is None:
+            return False
+        if not self._re.search(text):
+            return False
+        return not _LEFTOVER_RE.sub("", self._re.sub("", text))
+
+
+def load_glossary(path=GLOSSARY_FILE):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return Glossary(data.get("terms", {}), data.get("names", []))
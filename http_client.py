@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""共享 HTTP 客户端：按 host 复用 keep-alive 连接 + gzip 流式解压 + 重试/熔断 + 连接复用统计"""
+
+import codecs
+import http.client
+import json
+import os
+import random
+import ssl
+import threading
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin, urlsplit
+
+DEFAULT_TIMEOUT = 30
+MAX_IDLE_PER_HOST = 4
+MAX_REDIRECTS = 5
+READ_CHUNK = 16384
+
+# 重试：指数退避 + 抖动，优先听服务端的 Retry-After；整次运行共用一个重试预算
+MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "2") or 2)
+RETRY_BUDGET = int(os.environ.get("HTTP_RETRY_BUDGET", "12") or 12)
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+# Retry-After 要求等太久就不等了，直接失败（整次运行等不起）
+RETRY_AFTER_MAX = float(os.environ.get("HTTP_RETRY_AFTER_MAX", "20") or 20)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# 熔断：同一 host 连续 BREAKER_THRESHOLD 个请求（重试用完后）失败后，BREAKER_COOLDOWN 秒内直接失败不再发请求
+BREAKER_THRESHOLD = int(os.environ.get("HTTP_BREAKER_THRESHOLD", "3") or 3)
+BREAKER_COOLDOWN = float(os.environ.get("HTTP_BREAKER_COOLDOWN", "30") or 30)
+
+# 复用的空闲连接可能已被服务端关掉；这些错误说明请求根本没送达，可以换新连接重发一次
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                 BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+
+class HTTPError(Exception):
+    """状态码 >= 400（对应 urllib.error.HTTPError）。"""
+
+    def __init__(self, url, code, reason, body=b"", headers=None):
+        super().__init__(f"HTTP Error {code}: {reason}")
+        self.url = url
+        self.code = code
+        self.reason = reason
+        self.body = body
+        self.headers = headers or {}
+
+    def read(self):
+        return self.body
+
+
+class CircuitOpenError(Exception):
+    """host 的熔断器处于打开状态，请求没有发出。"""
+
+    def __init__(self, url, host):
+        super().__init__(f"circuit open for {host}")
+        self.url = url
+        self.host = host
+
+
+def _retry_after_seconds(headers):
+    """解析 Retry-After（秒数或 HTTP 日期），没有或解析不了返回 None。"""
+    value = (headers.get("Retry-After") or "").strip() if headers else ""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class CircuitBreaker:
+    """单个 host 的熔断器：closed -> (连续失败) open -> (冷却结束) half_open -> 试探成功 closed / 失败 open。"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, host, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN, on_change=None):
+        self.host = host
+        self.threshold = max(1, int(threshold))
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._on_change = on_change
+        self._lock = threading.Lock()
+
+    def _set(self, state, reason):
+        if state != self.state:
+            old, self.state = self.state, state
+            if self._on_change:
+                self._on_change(self.host, old, state, reason)
+
+    def allow(self):
+        """能否发请求；half_open 时只放一个试探请求过去。"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    return False
+                self._set(self.HALF_OPEN, "冷却结束，放一个试探请求")
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            self._set(self.CLOSED, "请求成功")
+
+    def record_failure(self, reason=""):
+        with self._lock:
+            self._failures += 1
+            probing, self._probing = self._probing, False
+            if probing or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+                self._set(self.OPEN, reason or f"连续失败 {self._failures} 次")
+
+
+class Response:
+    """流式响应。读完（或 close）后连接自动归还连接池。"""
+
+    def __init__(self, client, key, conn, resp, url):
+        self._client = client
+        self._key = key
+        self._conn = conn
+        self._resp = resp
+        self._finished = False
+        self._released = False
+        self.url = url
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.headers
+
+    def _decompressor(self):
+        enc = (self.headers.get("Content-Encoding") or "").lower()
+        if enc == "gzip":
+            return zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if enc == "deflate":
+            return zlib.decompressobj()
+        return None
+
+    def iter_chunks(self, chunk_size=READ_CHUNK):
+        """逐块产出解压后的数据；网络上到多少就解多少，不等整个 body。"""
+        decomp = self._decompressor()
+        try:
+            while True:
+                raw = self._resp.read1(chunk_size)
+                if not raw:
+                    break
+                out = decomp.decompress(raw) if decomp else raw
+                if out:
+                    yield out
+            if decomp:
+                tail = decomp.flush()
+                if tail:
+                    yield tail
+            # read1() 读到 Content-Length 刚好为 0 时不会自己关闭 fp，这里显式收尾，连接才能发下一个请求
+            self._resp.close()
+            self._finished = True
+        finally:
+            if self._finished:
+                self.close()
+
+    def iter_text(self, limit=None, encoding="utf-8"):
+        """逐块产出解码后的文本（增量解码，多字节字符跨块也不会乱码），最多 limit 字节。"""
+        decoder = codecs.getincrementaldecoder(encoding)(errors="ignore")
+        remaining = limit
+        for chunk in self.iter_chunks():
+            if remaining is not None:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+            if remaining is not None and remaining <= 0:
+                return
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def read(self, limit=None):
+        """读取（解压后）body；给了 limit 则最多读 limit 字节，读不完的连接直接丢弃。"""
+        buf = bytearray()
+        for chunk in self.iter_chunks():
+            buf += chunk
+            if limit is not None and len(buf) >= limit:
+                del buf[limit:]
+                break
+        self.close()
+        return bytes(buf)
+
+    def text(self, limit=None, encoding="utf-8"):
+        return self.read(limit).decode(encoding, errors="ignore")
+
+    def json(self):
+        return json.loads(self.read().decode("utf-8"))
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        reusable = self._finished and not self._resp.will_close
+        if not reusable:
+            self._resp.close()
+        self._client._release(self._key, self._conn, reusable)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class HTTPClient:
+    """线程安全的连接池：每个 (scheme, host, port) 保留最多 max_idle 个空闲连接。"""
+
+    def __init__(self, max_idle_per_host=MAX_IDLE_PER_HOST, user_agent=None,
+                 max_retries=MAX_RETRIES, retry_budget=RETRY_BUDGET):
+        self.max_idle_per_host = max_idle_per_host
+        self.user_agent = user_agent
+        self.max_retries = max(0, int(max_retries))
+        self.retry_budget = max(0, int(retry_budget))
+        # 返回整次运行还剩几秒（None = 不限时）的函数；重试退避不会超过它
+        self.time_left = None
+        self._ssl_context = ssl.create_default_context()
+        self._idle = {}
+        self._stats = {}
+        self._breakers = {}
+        self._breaker_events = []
+        self._retries_used = 0
+        self._lock = threading.Lock()
+
+    def _host_stats(self, host):
+        return self._stats.setdefault(host, {"requests": 0, "new": 0, "reused": 0, "retries": 0, "failures": 0})
+
+    def _breaker(self, host):
+        with self._lock:
+            br = self._breakers.get(host)
+            if br is None:
+                br = self._breakers[host] = CircuitBreaker(host, on_change=self._on_breaker_change)
+            return br
+
+    def _on_breaker_change(self, host, old, new, reason):
+        with self._lock:
+            self._breaker_events.append((time.time(), host, old, new, reason))
+        print(f"  ⚡ 熔断器 {host}: {old} -> {new}（{reason}）")
+
+    def _take_retry(self, host):
+        """从整次运行的重试预算里扣一次；预算用完返回 False。"""
+        with self._lock:
+            if self._retries_used >= self.retry_budget:
+                return False
+            self._retries_used += 1
+            self._host_stats(host)["retries"] += 1
+            return True
+
+    def _retry_wait(self, host, attempt, retries, retry_after=None):
+        """下一次重试前要等几秒；不该再重试（次数、Retry-After 太长、运行预算、重试预算）时返回 None。"""
+        if attempt >= retries:
+            return None
+        if retry_after is not None and retry_after > RETRY_AFTER_MAX:
+            return None
+        # full jitter：多个线程同时失败时错开重试时间
+        wait = retry_after if retry_after is not None else random.uniform(
+            0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+        left = self.time_left() if self.time_left is not None else None
+        if left is not None:
+            # 整次运行的预算等不起 Retry-After 就直接失败；普通退避最多等到预算用完
+            if left <= 0 or (retry_after is not None and retry_after > left):
+                return None
+            wait = min(wait, left)
+        if not self._take_retry(host):
+            return None
+        return wait
+
+    def _count_failure(self, host):
+        with self._lock:
+            self._host_stats(host)["failures"] += 1
+
+    def _acquire(self, key, timeout):
+        scheme, host, port = key
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+            st = self._host_stats(host)
+            st["requests"] += 1
+            st["reused" if conn else "new"] += 1
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        return conn, False
+
+    def _release(self, key, conn, reusable):
+        if reusable:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle_per_host:
+                    idle.append(conn)
+                    return
+        conn.close()
+
+    def _open(self, method, url, headers, body, timeout):
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL scheme: {url}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        hdrs = {"Accept-Encoding": "gzip"}
+        if self.user_agent:
+            hdrs["User-Agent"] = self.user_agent
+        hdrs.update(headers or {})
+
+        while True:
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request(method, path, body=body, headers=hdrs)
+                resp = conn.getresponse()
+            except _STALE_ERRORS:
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            return Response(self, key, conn, resp, url)
+
+    def request(self, method, url, headers=None, body=None, timeout=DEFAULT_TIMEOUT, retries=None,
+                before_retry=None):
+        """发请求并返回流式 Response；GET 自动跟随重定向，>= 400 抛 HTTPError。
+
+        429/5xx 和网络错误（超时、连接被重置……）按指数退避重试，最多 retries 次
+        （默认 max_retries），并受整次运行的重试预算限制。同一 host 连续失败后熔断，
+        冷却期内直接抛 CircuitOpenError，不再等超时。
+        before_retry: 每次重试发出前调用（如从限速令牌桶取一个令牌），首次请求不调用。
+        """
+        host = urlsplit(url).hostname or ""
+        breaker = self._breaker(host)
+        if not breaker.allow():
+            raise CircuitOpenError(url, host)
+        # 熔断按「一次逻辑请求」结算：重试都用完了才算一次失败。
+        # 429 只是限速（退避和 Retry-After 已经处理），和其他 4xx 一样说明 host 是好的
+        try:
+            resp = self._request_with_retries(host, method, url, headers, body, timeout, retries, before_retry)
+        except HTTPError as e:
+            if e.code in RETRY_STATUSES and e.code != 429:
+                breaker.record_failure(f"HTTP {e.code}")
+            else:
+                breaker.record_success()
+            raise
+        except BaseException as e:
+            # 网络错误以及其他任何异常都要结算，否则 half_open 的试探名额一直占着，host 就再也放不出请求
+            breaker.record_failure(type(e).__name__)
+            raise
+        breaker.record_success()
+        return resp
+
+    def _request_with_retries(self, host, method, url, headers, body, timeout, retries, before_retry):
+        retries = self.max_retries if retries is None else max(0, int(retries))
+        attempt = 0
+        while True:
+            try:
+                return self._request_once(method, url, headers, body, timeout)
+            except HTTPError as e:
+                if e.code not in RETRY_STATUSES:
+                    raise
+                self._count_failure(host)
+                wait = self._retry_wait(host, attempt, retries, _retry_after_seconds(e.headers))
+                if wait is None:
+                    raise
+            except (OSError, http.client.HTTPException):
+                self._count_failure(host)
+                wait = self._retry_wait(host, attempt, retries)
+                if wait is None:
+                    raise
+            time.sleep(wait)
+            if before_retry is not None:
+                before_retry()
+            attempt += 1
+
+    def _request_once(self, method, url, headers, body, timeout):
+        for _ in range(MAX_REDIRECTS + 1):
+            resp = self._open(method, url, headers, body, timeout)
+            location = resp.headers.get("Location")
+            if method == "GET" and resp.status in (301, 302, 303, 307, 308) and location:
+                resp.read(READ_CHUNK * 4)
+                url = urljoin(url, location)
+                continue
+            if resp.status >= 400:
+                err_body = resp.read(65536)
+                raise HTTPError(url, resp.status, resp.reason, err_body, resp.headers)
+            return resp
+        raise HTTPError(url, 310, "Too many redirects")
+
+    def get(self, url, headers=None, timeout=DEFAULT_TIMEOUT, retries=None, before_retry=None):
+        return self.request("GET", url, headers=headers, timeout=timeout, retries=retries,
+                            before_retry=before_retry)
+
+    def post_json(self, url, payload, headers=None, timeout=DEFAULT_TIMEOUT, retries=None, before_retry=None):
+        hdrs = {"Content-Type": "application/json"}
+        hdrs.update(headers or {})
+        data = json.dumps(payload).encode("utf-8")
+        return self.request("POST", url, headers=hdrs, body=data, timeout=timeout, retries=retries,
+                            before_retry=before_retry)
+
+    def stats(self):
+        with self._lock:
+            return {h: dict(st) for h, st in self._stats.items()}
+
+    def format_stats(self):
+        lines = []
+        for host, st in sorted(self.stats().items()):
+            line = f"  {host}: 请求 {st['requests']}，新建连接 {st['new']}，复用 {st['reused']}"
+            if st["failures"] or st["retries"]:
+                line += f"，失败 {st['failures']}，重试 {st['retries']}"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def breaker_events(self):
+        """熔断器状态变化 [(时间戳, host, 旧状态, 新状态, 原因)]。"""
+        with self._lock:
+            return list(self._breaker_events)
+
+    def format_resilience(self):
+        """运行小结：重试预算用量 + 熔断器状态变化；什么都没发生时返回空串。"""
+        with self._lock:
+            used = self._retries_used
+            events = list(self._breaker_events)
+            still_open = sorted(h for h, br in self._breakers.items() if br.state != CircuitBreaker.CLOSED)
+        if not used and not events:
+            return ""
+        lines = [f"  重试预算: 用了 {used} / {self.retry_budget}"]
+        for ts, host, old, new, reason in events:
+            lines.append(f"  {time.strftime('%H:%M:%S', time.localtime(ts))} {host}: {old} -> {new}（{reason}）")
+        if still_open:
+            lines.append(f"  结束时仍未恢复: {', '.join(still_open)}")
+        return "\n".join(lines)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """返回进程内共享的 HTTPClient。"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HTTPClient()
+        return _client
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""关键词多模式匹配：所有关键词编译成一个前缀树正则，每段文本只扫描一次，返回命中的全部类别"""
+
+import json
+import os
+import re
+
+KEYWORDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "keywords.json")
+
+
+def _is_word_char(ch):
+    # 与 re 的 \w 一致（Unicode 字母数字 + 下划线）
+    return ch.isalnum() or ch == "_"
+
+
+def _trie_pattern(node):
+    """把前缀树转成正则；某个词在此结束时后续分支是可选的（贪婪 => 最长匹配）。"""
+    alts = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch != ""]
+    if not alts:
+        return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    if "" in node:
+        body = "(?:" + body + ")?"
+    return body
+
+
+class KeywordMatcher:
+    """按类别组织的关键词表 -> 一个组合正则。
+
+    正则在每个起始位置给出最长的命中词；同一位置上更短的命中必然是它的前缀，
+    这些前缀词事先算好，命中后一并校验。word 模式的词边界在 Python 里检查
+    （只检查首/尾是字母数字的一端，等价于 \\b）。
+    """
+
+    def __init__(self, categories):
+        self.scopes = {}
+        terms = {}
+        for name, spec in categories.items():
+            if not isinstance(spec, dict):
+                continue
+            mode = spec.get("mode", "substring")
+            self.scopes[name] = spec.get("scope", "text")
+            for term in spec.get("terms", []):
+                term = str(term).lower()
+                if term:
+                    terms.setdefault(term, {}).setdefault(mode, set()).add(name)
+
+        # term -> [(mode, categories)]
+        self._terms = {t: [(m, frozenset(c)) for m, c in modes.items()] for t, modes in terms.items()}
+        self._edges = {t: (_is_word_char(t[0]), _is_word_char(t[-1])) for t in terms}
+        self._prefixes = {t: [p for p in terms if t.startswith(p)] for t in terms}
+
+        trie = {}
+        for t in terms:
+            node = trie
+            for ch in t:
+                node = node.setdefault(ch, {})
+            node[""] = True
+        self._re = re.compile(_trie_pattern(trie) or r"(?!x)x")
+
+    def _word_ok(self, text, term, start, end):
+        first_w, last_w = self._edges[term]
+        if first_w and start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if last_w and end < len(text) and _is_word_char(text[end]):
+            return False
+        return True
+
+    def scan(self, title, desc=None):
+        """扫描 "title desc"，返回命中的类别集合。scope=title 的类别只在标题范围内算命中。"""
+        title = (title or "").lower()
+        text = title if desc is None else f"{title} {(desc or '').lower()}"
+        title_end = len(title)
+        hits = set()
+        search = self._re.search
+        pos = 0
+        while True:
+            m = search(text, pos)
+            if m is None:
+                break
+            start = m.start()
+            pos = start + 1
+            for term in self._prefixes[m.group()]:
+                end = start + len(term)
+                for mode, cats in self._terms[term]:
+                    if mode == "word" and not self._word_ok(text, term, start, end):
+                        continue
+                    for c in cats:
+                        if c in hits or (end > title_end and self.scopes.get(c) == "title"):
+                            continue
+                        hits.add(c)
+        return hits
+
+
+def load_keyword_matcher(path=KEYWORDS_FILE):
+    with open(path, "r", encoding="utf-8") as f:
+        return KeywordMatcher(json.load(f))
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""64 位 SimHash 指纹 + 近重复分组（多表置换索引，线性时间）"""
+
+import hashlib
+import re
+from itertools import combinations
+
+BITS = 64
+_MASK = (1 << BITS) - 1
+_TOKEN_RE = re.compile(r"\w+")
+
+# 对近重复判断没有区分度的词
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+after over into new says said say more than about up out ai
+""".split())
+
+_token_hash_cache = {}
+
+
+def _token_hash(tok):
+    h = _token_hash_cache.get(tok)
+    if h is None:
+        # 用稳定的哈希（不能用内置 hash()，它每个进程随机），指纹才能跨天持久化
+        h = int.from_bytes(hashlib.blake2b(tok.encode("utf-8"), digest_size=8).digest(), "big")
+        _token_hash_cache[tok] = h
+    return h
+
+
+_SUFFIXES = ("ing", "ed", "es", "s")
+
+
+def _stem(tok):
+    # 粗略去词尾：unveils / unveiled / unveiling 算同一个词，转载改写时很常见
+    for suf in _SUFFIXES:
+        if len(tok) > len(suf) + 2 and tok.endswith(suf):
+            return tok[:-len(suf)]
+    return tok
+
+
+def tokenize(text):
+    return [_stem(t) for t in _TOKEN_RE.findall((text or "").lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def title_fingerprint(title):
+    """标题的精确指纹（去停用词/词尾、排序去重后取哈希），用于 O(1) 查重。"""
+    key = " ".join(sorted(set(tokenize(title))))
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest() if key else ""
+
+
+def simhash(title, desc="", title_weight=2):
+    """标题词权重更高：同一条新闻被转载时标题往往比摘要更稳定。没有可用的词时返回 None。"""
+    weights = {}
+    for tok in tokenize(title):
+        weights[tok] = weights.get(tok, 0) + title_weight
+    for tok in tokenize(desc):
+        weights[tok] = weights.get(tok, 0) + 1
+    if not weights:
+        return None  # 没有可比的词：不能当成指纹 0，否则所有空文本都会并成一组
+
+    v = [0] * BITS
+    for tok, w in weights.items():
+        h = _token_hash(tok)
+        for i in range(BITS):
+            if (h >> i) & 1:
+                v[i] += w
+            else:
+                v[i] -= w
+    fp = 0
+    for i in range(BITS):
+        if v[i] > 0:
+            fp |= 1 << i
+    return fp
+
+
+def hamming(a, b):
+    return bin((a ^ b) & _MASK).count("1")
+
+
+# 每张索引表的键至少这么多位：随机指纹落进同一个桶的概率 <= 1/65536，桶基本是 O(1) 大小
+MIN_KEY_BITS = 16
+
+
+def _index_tables(max_distance):
+    """多表置换索引（Manku 等人的做法）：把 64 位切成 k+r 块，任选 r 块拼成一张表的键。
+
+    距离 <= k 的两个指纹最多有 k 块不同，所以至少有一张表的键完全相同。
+    r 取满足「键宽 >= MIN_KEY_BITS」的最小值；k <= 3 时 r = 1，就是 4 张 16 位的表。
+    """
+    k = max(0, max_distance)
+    r = 1
+    while r * BITS // (k + r) < MIN_KEY_BITS and k + r < BITS:
+        r += 1
+    blocks = k + r
+    bounds = [(b * BITS // blocks, (b + 1) * BITS // blocks) for b in range(blocks)]
+    return [[bounds[b] for b in combo] for combo in combinations(range(blocks), r)]
+
+
+def group_near_duplicates(fingerprints, max_distance=8, stats=None):
+    """把汉明距离 <= max_distance 的指纹分到同一组（传递闭包），返回每个元素的组号。
+
+    只比较在某张索引表里键相同的元素，不做全量两两比较；键至少 16 位，
+    随机指纹下每个桶的期望大小是 n / 65536，比较次数随 n 线性增长。
+    表的张数只取决于 max_distance（6 -> 28 张，8 -> 165 张），与 n 无关，所以分组对 n 仍是线性的；
+    同标题转载的距离一般在 6~9 位，不相关的新闻在 25 位以上，默认取 8。
+    指纹为 None（没有可用的词）的元素各自成组。
+    stats: 传入 dict 时写入 comparisons（做了多少次汉明距离比较）。
+    """
+    n = len(fingerprints)
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    comparisons = 0
+    for t, table in enumerate(_index_tables(max_distance)):
+        buckets = {}
+        for i, fp in enumerate(fingerprints):
+            if fp is None:
+                continue
+            key = (t,) + tuple((fp >> lo) & ((1 << (hi - lo)) - 1) for lo, hi in table)
+            members = buckets.setdefault(key, [])
+            for j in members:
+                if find(i) != find(j):
+                    comparisons += 1
+                    if hamming(fp, fingerprints[j]) <= max_distance:
+                        parent[find(i)] = find(j)
+            members.append(i)
+    if stats is not None:
+        stats["comparisons"] = comparisons
+    return [find(i) for i in range(n)]
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""阶段依赖图执行器：互不依赖的阶段并行跑，记录每个阶段的耗时并找出关键路径"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class Stage:
+    def __init__(self, name, fn, deps):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.result = None
+        self.error = None
+        self.started = None
+        self.finished = None
+
+    @property
+    def duration(self):
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+
+class StageGraph:
+    """按依赖关系执行一组阶段。
+
+    add(name, fn, deps) 注册阶段，依赖必须先注册（保证无环）；fn 以关键字参数
+    接收各依赖阶段的返回值（参数名 = 依赖阶段名）。run() 时依赖都完成的阶段立即
+    提交到线程池；任一阶段抛异常后不再启动新阶段，等在跑的结束后把第一个异常抛出。
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.started = None
+
+    def add(self, name, fn, deps=()):
+        if name in self.stages:
+            raise ValueError(f"duplicate stage: {name}")
+        for d in deps:
+            if d not in self.stages:
+                raise ValueError(f"stage {name} depends on unknown stage {d}")
+        self.stages[name] = Stage(name, fn, deps)
+        return self
+
+    def result(self, name):
+        return self.stages[name].result
+
+    def _run_stage(self, stage):
+        stage.started = time.monotonic()
+        try:
+            return stage.fn(**{d: self.stages[d].result for d in stage.deps})
+        finally:
+            stage.finished = time.monotonic()
+
+    def run(self, max_workers=None):
+        self.started = time.monotonic()
+        waiting = list(self.stages.values())
+        done = set()
+        running = {}
+        first_error = None
+        with ThreadPoolExecutor(max_workers=max_workers or max(1, len(waiting)),
+                                thread_name_prefix="stage") as pool:
+            while waiting or running:
+                if first_error is None:
+                    for stage in [s for s in waiting if all(d in done for d in s.deps)]:
+                        waiting.remove(stage)
+                        running[pool.submit(self._run_stage, stage)] = stage
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    stage = running.pop(fut)
+                    try:
+                        stage.result = fut.result()
+                        done.add(stage.name)
+                    except BaseException as e:
+                        stage.error = e
+                        if first_error is None:
+                            first_error = e
+        if first_error is not None:
+            raise first_error
+        return {name: s.result for name, s in self.stages.items()}
+
+    def critical_path(self):
+        """从最后结束的阶段往回走，每一步取最晚结束的依赖：这条链决定了总耗时。"""
+        ran = [s for s in self.stages.values() if s.finished is not None]
+        if not ran:
+            return []
+        node = max(ran, key=lambda s: s.finished)
+        path = [node]
+        while node.deps:
+            deps = [self.stages[d] for d in node.deps if self.stages[d].finished is not None]
+            if not deps:
+                break
+            node = max(deps, key=lambda s: s.finished)
+            path.append(node)
+        return list(reversed(path))
+
+    def format_timings(self):
+        lines = []
+        width = max((len(n) for n in self.stages), default=0)
+        for s in sorted(self.stages.values(), key=lambda s: (s.started is None, s.started or 0)):
+            if s.started is None:
+                lines.append(f"  {s.name:<{width}}  未运行")
+                continue
+            status = "  ✗ 失败" if s.error is not None else ""
+            lines.append(f"  {s.name:<{width}}  开始 +{s.started - self.started:5.1f}s  用时 {s.duration:5.1f}s{status}")
+        path = self.critical_path()
+        if path:
+            total = path[-1].finished - self.started
+            chain = " → ".join(f"{s.name} ({s.duration:.1f}s)" for s in path)
+            lines.append(f"  关键路径: {chain}，共 {total:.1f}s")
+        return "\n".join(lines)
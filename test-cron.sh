@@ -36,9 +36,9 @@ finish_log() {
   DOC_UPDATE_ITEMS="$DOC_UPDATE_ITEMS" \
   python3 "$REPO_DIR/update_log.py" >> "$LOG_FILE" 2>&1 || true
 
-  # 更新首页里的“更新日志”模块
+  # 更新首页里的“更新日志”模块（只刷新首页，日报页面在 generate-daily.py 里已经生成过）
   cd "$REPO_DIR"
-  python3 convert.py >> "$LOG_FILE" 2>&1 || true
+  python3 convert.py --index-only >> "$LOG_FILE" 2>&1 || true
 
   {
     echo "状态: $STATUS"
@@ -59,7 +59,8 @@ export GITHUB_TOKEN="${GITHUB_TOKEN:?missing GITHUB_TOKEN}"
 
 echo "环境变量检查: [ok]" >> "$LOG_FILE"
 
-# 运行生成
+# 运行生成（RUN_DEADLINE 秒内出刊，超时的阶段自动降级；上次的运行报告先清掉）
+rm -f "$REPO_DIR/logs/run-report.json"
 python3 generate-daily.py >> "$LOG_FILE" 2>&1
 
 # 构建“文档更新记录”内容（供前端模块展示）
@@ -0,0 +1,18 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 仓库是平铺的脚本，测试直接 import 根目录下的模块
+sys.path.insert(0, REPO_ROOT)
+
+
+@pytest.fixture(scope="session")
+def gd():
+    """generate-daily.py（文件名带连字符，按路径加载）。"""
+    spec = importlib.util.spec_from_file_location("generate_daily", os.path.join(REPO_ROOT, "generate-daily.py"))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
@@ -0,0 +1,25 @@
+import importlib
+
+import deadline
+
+
+def _reload_with(monkeypatch, value):
+    monkeypatch.setenv("RUN_DEADLINE", value)
+    return importlib.reload(deadline).DEFAULT_DEADLINE
+
+
+def test_empty_run_deadline_uses_default(monkeypatch):
+    try:
+        assert _reload_with(monkeypatch, "") == 90
+        assert _reload_with(monkeypatch, "0") == 0
+        assert _reload_with(monkeypatch, "45") == 45
+    finally:
+        monkeypatch.delenv("RUN_DEADLINE")
+        importlib.reload(deadline)
+
+
+def test_remaining_for_whole_run():
+    budget = deadline.RunBudget(total=100)
+    assert 99 < budget.remaining() <= 100
+    assert budget.remaining("search") <= 35
+    assert deadline.RunBudget(total=0).remaining() is None
@@ -0,0 +1,39 @@
+from direct_entries import iter_direct_entries
+
+HTML = (
+    '<p>Repo: <a href="https://github.com/encode/httpx-extra">httpx-extra</a>, '
+    'also on <a href="https://pypi.org/project/httpx-extra/">PyPI</a> and '
+    '<a href="https://huggingface.co/spaces/acme/http-demo">a demo</a>. '
+    'Mirror: https://github.com/encode/httpx-extra/ again.</p>'
+)
+EXPECTED = [
+    "https://github.com/encode/httpx-extra",
+    "https://pypi.org/project/httpx-extra",
+    "https://huggingface.co/spaces/acme/http-demo",
+]
+
+
+def test_single_chunk():
+    assert list(iter_direct_entries([HTML])) == EXPECTED
+
+
+def test_url_with_http_in_path_split_mid_url():
+    chunks = ['<a href="https://github.com/encode/httpx-ex', 'tra">x</a>']
+    assert list(iter_direct_entries(chunks)) == ["https://github.com/encode/httpx-extra"]
+
+
+def test_every_split_point():
+    for i in range(len(HTML) + 1):
+        assert list(iter_direct_entries([HTML[:i], HTML[i:]])) == EXPECTED, i
+
+
+def test_every_pair_of_split_points():
+    step = 3
+    for i in range(0, len(HTML) + 1, step):
+        for j in range(i, len(HTML) + 1, step):
+            chunks = [HTML[:i], HTML[i:j], HTML[j:]]
+            assert list(iter_direct_entries(chunks)) == EXPECTED, (i, j)
+
+
+def test_one_character_chunks():
+    assert list(iter_direct_entries(list(HTML))) == EXPECTED
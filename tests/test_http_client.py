@@ -0,0 +1,114 @@
+import pytest
+
+import http_client
+from http_client import CircuitBreaker, HTTPClient, HTTPError
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(http_client.time, "sleep", lambda s: None)
+
+
+def test_before_retry_runs_before_each_retry(monkeypatch):
+    client = HTTPClient(max_retries=2)
+    calls = []
+
+    def fake_once(method, url, headers, body, timeout):
+        calls.append("request")
+        raise HTTPError(url, 429, "Too Many Requests")
+
+    monkeypatch.setattr(client, "_request_once", fake_once)
+    with pytest.raises(HTTPError):
+        client.get("https://api.example.com/x", before_retry=lambda: calls.append("token"))
+    assert calls == ["request", "token", "request", "token", "request"]
+
+
+def test_half_open_probe_released_after_unexpected_error(monkeypatch):
+    client = HTTPClient(max_retries=0)
+    breaker = client._breaker("api.example.com")
+    breaker.cooldown = 0
+    breaker.state = CircuitBreaker.OPEN
+
+    def boom(method, url, headers, body, timeout):
+        raise KeyError("unexpected")
+
+    monkeypatch.setattr(client, "_request_once", boom)
+    with pytest.raises(KeyError):
+        client.get("https://api.example.com/x")
+    assert breaker.state == CircuitBreaker.OPEN
+    # 冷却结束后还能再放一个试探请求
+    monkeypatch.setattr(client, "_request_once", lambda *a: "ok")
+    assert client.get("https://api.example.com/x") == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_backoff_capped_at_run_budget(monkeypatch):
+    client = HTTPClient(max_retries=1)
+    client.time_left = lambda: 0.01
+    sleeps = []
+    monkeypatch.setattr(http_client.time, "sleep", sleeps.append)
+    monkeypatch.setattr(http_client, "BACKOFF_BASE", 100.0)
+    attempts = iter([HTTPError("u", 503, "Unavailable"), None])
+
+    def fake_once(method, url, headers, body, timeout):
+        err = next(attempts)
+        if err:
+            raise err
+        return "ok"
+
+    monkeypatch.setattr(client, "_request_once", fake_once)
+    assert client.get("https://api.example.com/x") == "ok"
+    assert sleeps and max(sleeps) <= 0.01
+
+
+def test_no_retry_once_run_budget_spent(monkeypatch):
+    client = HTTPClient(max_retries=3)
+    client.time_left = lambda: 0
+    calls = []
+
+    def fake_once(method, url, headers, body, timeout):
+        calls.append(1)
+        raise HTTPError(url, 503, "Unavailable", headers={"Retry-After": "1"})
+
+    monkeypatch.setattr(client, "_request_once", fake_once)
+    with pytest.raises(HTTPError):
+        client.get("https://api.example.com/x")
+    assert len(calls) == 1
+    assert client._retries_used == 0
+
+
+def _always(monkeypatch, client, code):
+    calls = []
+
+    def fake_once(method, url, headers, body, timeout):
+        calls.append(1)
+        raise HTTPError(url, code, "error")
+
+    monkeypatch.setattr(client, "_request_once", fake_once)
+    return calls
+
+
+def test_rate_limited_request_leaves_breaker_closed(monkeypatch):
+    client = HTTPClient(max_retries=2)
+    calls = _always(monkeypatch, client, 429)
+    with pytest.raises(HTTPError):
+        client.get("https://api.example.com/x")
+    assert len(calls) == 3
+    assert client._breaker("api.example.com").state == CircuitBreaker.CLOSED
+    # 下一个请求照常发出，不会被 CircuitOpenError 挡掉
+    with pytest.raises(HTTPError):
+        client.get("https://api.example.com/y")
+    assert len(calls) == 6
+
+
+def test_one_retried_5xx_request_counts_once(monkeypatch):
+    client = HTTPClient(max_retries=2)
+    breaker = client._breaker("api.example.com")
+    _always(monkeypatch, client, 503)
+    for _ in range(breaker.threshold - 1):
+        with pytest.raises(HTTPError):
+            client.get("https://api.example.com/x")
+        assert breaker.state == CircuitBreaker.CLOSED
+    with pytest.raises(HTTPError):
+        client.get("https://api.example.com/x")
+    assert breaker.state == CircuitBreaker.OPEN
@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+
+NOW = datetime(2026, 3, 7, 12, 0)
+AGE = (NOW - timedelta(hours=3)).isoformat()
+
+
+def _result(url, title, description):
+    return {"url": url, "title": title, "description": description, "page_age": AGE}
+
+
+def test_syndicated_story_published_once(gd):
+    title = "OpenAI unveils GPT-5 model for enterprise customers"
+    results = [
+        _result("https://www.reuters.com/technology/openai-unveils-gpt-5-2026-03-07/", title,
+                "OpenAI on Tuesday unveiled GPT-5, its new flagship model, for enterprise customers, "
+                "promising better reasoning and lower costs."),
+        _result("https://www.cnbc.com/2026/03/07/openai-unveils-gpt-5.html", title,
+                "OpenAI on Tuesday unveiled GPT-5, its new model, for enterprise customers, "
+                "promising better reasoning and lower costs."),
+        _result("https://www.theverge.com/2026/3/7/nvidia-blackwell-chip-shipments-delayed",
+                "Nvidia delays Blackwell chip shipments to cloud providers",
+                "Nvidia said shipments of its Blackwell AI chips to major cloud providers will slip "
+                "by a quarter after a packaging issue."),
+    ]
+    candidates = [r for r in gd._build_news_candidates(results, NOW) if r["tier"] is not None]
+    assert len(candidates) == 3, "fixture should pass the tier filters on its own"
+
+    selected = gd._select_news(results, NOW)
+    titles = [it["title"] for it in selected]
+    assert titles.count(title) == 1
+    assert "Nvidia delays Blackwell chip shipments to cloud providers" in titles
@@ -0,0 +1,50 @@
+import random
+
+from simhash import group_near_duplicates, hamming, simhash
+
+
+def _random_fingerprints(n, seed=0):
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(n)]
+
+
+def test_near_duplicates_grouped():
+    base = 0x0123456789ABCDEF
+    fps = [base, base ^ 0b101, base ^ (1 << 63) ^ (1 << 20) ^ 1, ~base & ((1 << 64) - 1)]
+    groups = group_near_duplicates(fps, max_distance=3)
+    assert groups[0] == groups[1] == groups[2]
+    assert groups[3] != groups[0]
+
+
+def test_every_pair_within_distance_is_found():
+    rng = random.Random(1)
+    fps = []
+    for _ in range(200):
+        fp = rng.getrandbits(64)
+        flipped = fp
+        for bit in rng.sample(range(64), 3):
+            flipped ^= 1 << bit
+        fps += [fp, flipped]
+    groups = group_near_duplicates(fps, max_distance=3)
+    for i in range(0, len(fps), 2):
+        assert hamming(fps[i], fps[i + 1]) <= 3
+        assert groups[i] == groups[i + 1]
+
+
+def test_comparisons_stay_below_n():
+    # 随机指纹下每张表的桶期望大小是 n / 65536：每个元素做的比较次数是常数级，远不到 n
+    for max_distance, sizes in ((3, (1000, 2000, 4000)), (8, (250, 500, 1000))):
+        counts = {}
+        for n in sizes:
+            stats = {}
+            group_near_duplicates(_random_fingerprints(n), max_distance=max_distance, stats=stats)
+            counts[n] = stats["comparisons"]
+        for n, c in counts.items():
+            assert c < n, (max_distance, counts)
+
+
+def test_texts_without_tokens_stay_separate():
+    fps = [simhash("", ""), simhash("the of and", ""), simhash("OpenAI ships a new model", "")]
+    assert fps[0] is None and fps[1] is None
+    groups = group_near_duplicates(fps)
+    assert len(set(groups)) == 3
@@ -0,0 +1,13 @@
+from text_clean import clean_text
+
+
+def test_tags_entities_and_whitespace():
+    assert clean_text("<strong>OpenAI</strong>&#x27;s  new&nbsp;model &ldquo;o5&rdquo;") == "OpenAI's new model \"o5\""
+
+
+def test_promo_tail_removed():
+    assert clean_text("Big launch today. Subscribe to our newsletter") == "Big launch today."
+
+
+def test_empty():
+    assert clean_text(None) == "" and clean_text("") == ""
@@ -0,0 +1,30 @@
+import json
+
+TEXTS = [
+    "OpenAI unveils a new reasoning model for enterprise customers today",
+    "Nvidia delays Blackwell chip shipments to major cloud providers",
+    "Anthropic raises new funding round to expand its compute capacity",
+]
+
+
+def test_batch_fallback_counts_one_miss_per_string(gd, monkeypatch, tmp_path):
+    monkeypatch.setattr(gd, "TRANSLATION_CACHE_PATH", str(tmp_path / "translations.sqlite3"))
+    monkeypatch.setattr(gd, "_translation_cache", None)
+
+    def fake_chat(system, user, max_tokens=500, json_mode=False, timeout=None):
+        if json_mode:
+            items = json.loads(user)["items"]
+            # 批量回复漏掉最后一条，逼它走逐条补翻
+            return json.dumps({"items": [{"id": it["id"], "text": "译文"} for it in items[:-1]]})
+        return "补翻译文"
+
+    monkeypatch.setattr(gd, "_deepseek_chat", fake_chat)
+    results = [f.result(timeout=10) for f in gd.submit_translations(TEXTS)]
+    assert results == ["译文", "译文", "补翻译文"]
+
+    cache = gd._get_translation_cache()
+    stats = cache.stats()
+    assert stats["misses"] == len(TEXTS)
+    assert stats["hits"] == 0
+    assert stats["entries"] == len(TEXTS)
+    cache.close()
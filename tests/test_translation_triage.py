@@ -0,0 +1,25 @@
+from glossary import load_glossary
+from translation_triage import ROUTE_GLOSSARY, ROUTE_MODEL, ROUTE_SKIP, triage
+
+GLOSSARY = load_glossary()
+
+
+def test_chinese_is_skipped():
+    assert triage("OpenAI 发布新一代推理模型，性能大幅提升", GLOSSARY) == (ROUTE_SKIP, "chinese")
+
+
+def test_korean_goes_to_model():
+    route, _ = triage("오픈AI가 새로운 추론 모델을 공개했다", GLOSSARY)
+    assert route == ROUTE_MODEL
+
+
+def test_japanese_goes_to_model():
+    # 汉字不少，但假名说明这是日文
+    route, _ = triage("東京大学の研究チームが新しいAIモデルを発表した", GLOSSARY)
+    assert route == ROUTE_MODEL
+
+
+def test_english_routes():
+    assert triage("https://github.com/openai/gpt-5", GLOSSARY)[0] == ROUTE_SKIP
+    assert triage("ChatGPT", GLOSSARY)[0] == ROUTE_GLOSSARY
+    assert triage("OpenAI unveils a new reasoning model for enterprise customers", GLOSSARY)[0] == ROUTE_MODEL
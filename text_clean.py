@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Brave 标题/描述的清理：去标签、解码 HTML 实体、合并空白、截掉推广信息"""
+
+import re
+from html.entities import html5 as html5_entities
+
+# clean_text：标签直接删（不走回调），实体统一解码；弯引号按原来的习惯转成直引号
+_TAG_RE = re.compile(r"<[^>]+>")
+_ENTITY_RE = re.compile(r"&(#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);")
+_PROMO_RE = re.compile(r"subscribe|register|login", re.IGNORECASE)
+_ENTITY_OVERRIDES = {
+    'nbsp': ' ',
+    'ldquo': '"',
+    'rdquo': '"',
+    'lsquo': "'",
+    'rsquo': "'",
+}
+
+
+def _replace_entity(m):
+    ref = m.group(1)
+    if ref[0] == '#':
+        try:
+            cp = int(ref[2:], 16) if ref[1] in 'xX' else int(ref[1:])
+        except ValueError:
+            return m.group(0)
+        if 0 < cp < 0x110000 and not 0xD800 <= cp <= 0xDFFF:
+            return chr(cp)
+        return '\ufffd'
+    if ref in _ENTITY_OVERRIDES:
+        return _ENTITY_OVERRIDES[ref]
+    return html5_entities.get(ref + ';', m.group(0))
+
+
+def clean_text(text):
+    """清理文本：去标签、解码全部 HTML 实体、合并空白、截掉推广信息"""
+    if not text:
+        return ''
+    # 没有 < / & 的文本（大多数标题）直接跳过正则
+    if '<' in text:
+        text = _TAG_RE.sub('', text)
+    if '&' in text:
+        text = _ENTITY_RE.sub(_replace_entity, text)
+    # 合并空白（split 按 Unicode 空白切分，与 \s+ 一致）
+    text = ' '.join(text.split())
+    # 移除推广信息（Subscribe / Register / Login 及其后面的内容）
+    m = _PROMO_RE.search(text)
+    if m:
+        text = text[:m.start()]
+    return text.strip()
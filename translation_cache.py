@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""翻译结果的持久化缓存（SQLite）：同一段英文 + 同一模型 + 同一版提示词只付一次 API 费用"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("TRANSLATE_CACHE_MAX_ENTRIES", "5000") or 5000)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    key         TEXT PRIMARY KEY,
+    model       TEXT NOT NULL,
+    prompt_ver  TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    created     REAL NOT NULL,
+    last_used   REAL NOT NULL,
+    hits        INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+def prompt_version(*prompts):
+    """提示词内容的短哈希；提示词一改，旧缓存自然失效。"""
+    h = hashlib.blake2b(digest_size=6)
+    for p in prompts:
+        h.update(p.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class TranslationCache:
+    """key = sha256(原文) + 模型名 + 提示词版本；超过 max_entries 时按最近使用时间淘汰（LRU）。
+
+    线程安全（翻译在线程池里跑）；打不开数据库时退化成不缓存，不影响翻译本身。
+    """
+
+    def __init__(self, path, model, prompt_ver, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.model = model
+        self.prompt_ver = prompt_ver
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute(_SCHEMA)
+        except sqlite3.Error as e:
+            print(f"  翻译缓存不可用: {e}")
+            self._db = None
+
+    def _key(self, text):
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{digest}|{self.model}|{self.prompt_ver}"
+
+    def get(self, text):
+        if self._db is None:
+            return None
+        key = self._key(text)
+        with self._lock:
+            try:
+                row = self._db.execute("SELECT translation FROM translations WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self._db.execute("UPDATE translations SET last_used = ?, hits = hits + 1 WHERE key = ?",
+                                 (time.time(), key))
+            except sqlite3.Error:
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, text, translation):
+        if self._db is None or not translation:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations (key, model, prompt_ver, translation, created, last_used, hits)"
+                    " VALUES (?, ?, ?, ?, ?, ?, 0)",
+                    (self._key(text), self.model, self.prompt_ver, translation, now, now))
+                self.writes += 1
+            except sqlite3.Error:
+                pass
+
+    def evict(self):
+        """删掉最近最少使用的条目，只保留 max_entries 条；返回删除条数。"""
+        if self._db is None:
+            return 0
+        with self._lock:
+            try:
+                cur = self._db.execute(
+                    "DELETE FROM translations WHERE key IN ("
+                    " SELECT key FROM translations ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,))
+                return cur.rowcount
+            except sqlite3.Error:
+                return 0
+
+    def stats(self):
+        entries = 0
+        if self._db is not None:
+            with self._lock:
+                try:
+                    entries = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "entries": entries,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        if self._db is not None:
+            with self._lock:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""翻译分流：本地判断每个字符串该跳过、只查术语表，还是真的需要调用模型"""
+
+import re
+
+ROUTE_SKIP = "skip"
+ROUTE_GLOSSARY = "glossary"
+ROUTE_MODEL = "model"
+ROUTES = (ROUTE_SKIP, ROUTE_GLOSSARY, ROUTE_MODEL)
+
+# 汉字占（汉字 + 假名/谚文 + 英文单词）的比例达到这个值，就当作已经是中文
+CJK_SKIP_RATIO = 0.5
+# 标识符（owner/repo、snake_case、版本号……）占词数的比例达到这个值，就当作代码，不翻
+IDENT_SKIP_RATIO = 0.5
+# 不超过这个长度的短串只做术语替换（与原来的 len(text) > 30 门槛一致）
+MODEL_MIN_CHARS = 31
+
+# 只认汉字（基本区、扩展 A~F、兼容表意字）；日文假名和韩文谚文不算中文，要交给模型翻
+_CJK_RE = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\U00020000-\U0002fa1f]")
+# 平假名、片假名（含半角）、谚文字母与音节
+_KANA_HANGUL_RE = re.compile(r"[\u3040-\u30ff\u31f0-\u31ff\uff65-\uff9f\u1100-\u11ff\u3130-\u318f\uac00-\ud7af]")
+_LATIN_WORD_RE = re.compile(r"[A-Za-z]+")
+_URL_RE = re.compile(r"^(?:https?://|www\.)\S+$", re.IGNORECASE)
+_IDENT_RE = re.compile(r"""
+    [\w.-]+/[\w./-]+            # owner/repo、路径
+  | \w*[a-z0-9]_\w+             # snake_case
+  | [a-z]+[A-Z][\w]*            # camelCase
+  | [\w-]+\.(?:[a-z]{1,4}|dev|json|yaml|toml)   # 文件名、域名式名字（v0.dev、llama.cpp）
+  | v?\d+(?:\.\d+)+[\w.-]*      # 版本号
+  | --?[a-z][\w-]*              # 命令行参数
+  | [\w.]+\(\)                  # 函数调用
+  | [A-Z0-9_]{2,}_[A-Z0-9_]+    # 常量
+""", re.VERBOSE)
+_TOKEN_STRIP = "()[]{}<>\"'`,;:!?。，；：！？"
+
+
+def cjk_ratio(text):
+    # 英文按词计、中文按字计：一个汉字和一个英文单词的信息量差不多；
+    # 假名/谚文算进分母，日文里的汉字撑不到「已是中文」
+    cjk = len(_CJK_RE.findall(text))
+    other = len(_LATIN_WORD_RE.findall(text)) + len(_KANA_HANGUL_RE.findall(text))
+    return cjk / (cjk + other) if cjk + other else 0.0
+
+
+def identifier_ratio(text):
+    tokens = [t.strip(_TOKEN_STRIP) for t in text.split()]
+    tokens = [t for t in tokens if t and any(ch.isalnum() for ch in t)]
+    if not tokens:
+        return 0.0
+    idents = sum(1 for t in tokens if _IDENT_RE.fullmatch(t))
+    return idents / len(tokens)
+
+
+def triage(text, glossary=None):
+    """返回 (route, reason)。
+
+    skip     -> 原样输出（空串/链接/已是中文/基本是代码标识符）
+    glossary -> 只做术语表替换（纯已知名称、短串）
+    model    -> 需要调用模型（英文句子；日文/韩文不论长短）
+    """
+    stripped = (text or "").strip()
+    if len(stripped) < 5:
+        return ROUTE_SKIP, "short"
+    if _URL_RE.match(stripped) or stripped.startswith("http"):
+        return ROUTE_SKIP, "url"
+    if cjk_ratio(stripped) >= CJK_SKIP_RATIO:
+        return ROUTE_SKIP, "chinese"
+    if _KANA_HANGUL_RE.search(stripped):
+        # 术语表只管英文，日文/韩文短串也得让模型翻
+        return ROUTE_MODEL, "japanese_korean"
+    if identifier_ratio(stripped) >= IDENT_SKIP_RATIO:
+        return ROUTE_SKIP, "identifiers"
+    if glossary is not None and glossary.covers(stripped):
+        return ROUTE_GLOSSARY, "names"
+    if len(text) < MODEL_MIN_CHARS:
+        return ROUTE_GLOSSARY, "short"
+    return ROUTE_MODEL, "sentence"
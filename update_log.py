@@ -16,6 +16,8 @@ SYSTEM_HISTORY_JSON = os.path.join(LOG_DIR, "system-log-history.json")
 SYSTEM_HISTORY_MD = os.path.join(LOG_DIR, "system-log-history.md")
 DOC_HISTORY_JSON = os.path.join(LOG_DIR, "doc-update-history.json")
 DOC_HISTORY_MD = os.path.join(LOG_DIR, "doc-update-history.md")
+# generate-daily.py 写的本次运行报告（时间预算 + 降级记录）
+RUN_REPORT_JSON = os.path.join(LOG_DIR, "run-report.json")
 
 
 def _load_json(path, default):
@@ -64,6 +66,11 @@ def main():
             continue
         doc_items.append({"path": path, "summary": summary_text})
 
+    run_report = _load_json(os.environ.get("UPDATE_RUN_REPORT", RUN_REPORT_JSON), {})
+    if not isinstance(run_report, dict):
+        run_report = {}
+    degradations = [d for d in run_report.get("degradations", []) if isinstance(d, dict)][:20]
+
     history = _load_json(HISTORY_JSON, [])
     item = {
         "run_id": run_id,
@@ -74,6 +81,10 @@ def main():
         "summary": summary,
         "details": details,
     }
+    if run_report:
+        item["elapsed_seconds"] = run_report.get("elapsed_seconds")
+        item["deadline_seconds"] = run_report.get("deadline_seconds")
+        item["degradations"] = degradations
     history.insert(0, item)
     history = history[:200]
     _save_json(HISTORY_JSON, history)
@@ -90,7 +101,11 @@ def main():
     lines = ["# AI Daily 更新日志", "", "| 时间 | 触发方式 | 状态 | 更新内容 |", "|---|---|---|---|"]
     for x in history[:50]:
         emoji = "✅" if x.get("status") == "success" else "❌"
-        lines.append(f"| {x.get('finished_at','')} | {x.get('trigger','')} | {emoji} {x.get('status','')} | {x.get('summary','')} |")
+        summary_text = x.get('summary', '')
+        if x.get("degradations"):
+            emoji = "⚠️" if x.get("status") == "success" else emoji
+            summary_text += "（降级: " + "；".join(str(d.get("detail", "")) for d in x["degradations"][:3]) + "）"
+        lines.append(f"| {x.get('finished_at','')} | {x.get('trigger','')} | {emoji} {x.get('status','')} | {summary_text} |")
 
     with open(HISTORY_MD, "w", encoding="utf-8") as f:
         f.write("\n".join(lines) + "\n")